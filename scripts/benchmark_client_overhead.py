@@ -0,0 +1,79 @@
+"""
+Micro-benchmark of the per-request preparation overhead of Client (auth header, headers dict, URL),
+network excluded.
+
+- before: the preparation as it was done on every request, the token was fetched again on each call
+  because its expiry was set one year in the past, and the headers and URL were rebuilt
+- after: Client._token_expired + Client._prepare, the auth header and URL prefix are built once
+
+Usage:
+    PYTHONPATH=src python scripts/benchmark_client_overhead.py [iterations]
+"""
+import datetime
+import sys
+import timeit
+
+from mobigen.datafabric.client.auth_provider import AuthenticationProvider
+from mobigen.datafabric.client.client import Client
+from mobigen.datafabric.client.client_config import ClientConfig
+from mobigen.datafabric.client.client_util import URL
+
+JWT = ("eyJhbGciOiJSUzI1NiJ9."
+       "eyJzdWIiOiJhZG1pbiIsImlzQm90IjpmYWxzZSwiaXNzIjoib3Blbi1tZXRhZGF0YS5vcmciLCJpYXQiOjE2NjM5Mzg0NjJ9."
+       "signature")
+PATH = "/glossaryTerms"
+
+
+def make_client() -> Client:
+    provider = AuthenticationProvider.create(JWT)
+    return Client(ClientConfig(
+        base_url="http://localhost:8585/api",
+        api_version="v1",
+        auth_header="Authorization",
+        auth_token=provider.get_access_token,
+        extra_headers={"X-Forwarded-Authorization": "%(Authorization)s"},
+    ))
+
+
+def prepare_before(client: Client, expired_provider):
+    """ Request preparation of the previous Client._request """
+    headers = {"Content-type": "application/json"}
+    url = URL(client._base_url + "/" + client._api_version + PATH)
+    config = client.config
+    if (config.expires_in and datetime.datetime.utcnow().timestamp() >= config.expires_in
+            or not config.access_token):
+        config.access_token, expiry = expired_provider()
+        if isinstance(expiry, datetime.datetime):
+            config.expires_in = expiry.timestamp() - 120
+        else:
+            config.expires_in = datetime.datetime.utcnow().timestamp() + expiry - 120
+    headers[config.auth_header] = f"{client._auth_token_mode} {config.access_token}"
+    if config.extra_headers:
+        extra_headers = {k: (v % headers) for k, v in config.extra_headers.items()}
+        headers = {**headers, **extra_headers}
+    return url, headers
+
+
+def prepare_after(client: Client):
+    if client._token_expired():
+        client._refresh_token()
+    return client._prepare(PATH)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    before_client = make_client()
+    past = datetime.datetime.now() - datetime.timedelta(days=365)
+    expired_provider = lambda: (JWT, past)  # noqa: E731
+    after_client = make_client()
+
+    before = timeit.timeit(lambda: prepare_before(before_client, expired_provider), number=iterations)
+    after = timeit.timeit(lambda: prepare_after(after_client), number=iterations)
+    print(f"iterations: {iterations}")
+    print(f"before: {before / iterations * 1e6:.2f} us/request")
+    print(f"after:  {after / iterations * 1e6:.2f} us/request")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Import time of the CLI entry point, measured with `python -X importtime`.
+
+The heavy dependencies (pandas, openpyxl, requests, aiohttp, the generated models) are imported by the
+sub-command that needs them, importing mobigen.datafabric.__main__ must stay under the budget and
+must not load them.
+
+Usage:
+    PYTHONPATH=src python scripts/benchmark_import_time.py [--module M] [--budget_ms 300] [--top 15]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+DEFAULT_MODULE = "mobigen.datafabric.__main__"
+DEFAULT_BUDGET_MS = 300.0
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "pyarrow", "requests", "aiohttp", "generated")
+
+# import time:      self [us] | cumulative | imported package
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+
+
+def measure(module: str) -> List[Tuple[str, int, int, int]]:
+    """
+    :return: (module, self us, cumulative us, nesting level) of every module imported by `import module`
+    """
+    env = dict(os.environ)
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (src, env.get("PYTHONPATH")) if p)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"Failed To Import {module}")
+    imports = []
+    for line in proc.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI Import Time Benchmark")
+    parser.add_argument('--module', type=str, required=False, default=DEFAULT_MODULE, help='module to import')
+    parser.add_argument('--budget_ms', type=float, required=False, default=DEFAULT_BUDGET_MS,
+                        help='fail when the cumulative import time is over the budget')
+    parser.add_argument('--top', type=int, required=False, default=15, help='number of the slowest imports to show')
+    args = parser.parse_args()
+
+    imports = measure(args.module)
+    # top level imports only, the cumulative time includes their nested imports
+    total_ms = sum(cumulative for _, _, cumulative, level in imports if level == 0) / 1000
+    cumulative_of: Dict[str, int] = {name: cumulative for name, _, cumulative, _ in imports}
+
+    print(f"{args.module}: {total_ms:.1f} ms, {len(imports)} modules")
+    for name, cumulative in sorted(cumulative_of.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    loaded = sorted({name.split(".")[0] for name in cumulative_of} & set(HEAVY_MODULES))
+    failed = False
+    if loaded:
+        print(f"Heavy Modules Loaded At Startup: {', '.join(loaded)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"Over Budget: {total_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,12 @@ setup(
         "datamodel-code-generator==0.25.9",
         "openpyxl==3.1.5",
         "requests==2.32.3",
+        "aiohttp==3.9.5",
     ],
+    extras_require={
+        # Faster JSON encoding/decoding of the request and response bodies
+        "fast": ["orjson>=3.8"],
+    },
     entry_points={
         'console_scripts': [
             # 'command_name = package.module:function',
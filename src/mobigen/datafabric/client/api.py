@@ -19,18 +19,21 @@ import traceback
 from typing import Dict, Iterable, List, Optional, Type, TypeVar, Union
 
 from pydantic.v1 import BaseModel
-from pydantic.v1.json import pydantic_encoder
 from requests.compat import quote
 
 from generated.schema.type import basic
 from generated.schema.type.basic import FullyQualifiedEntityName
 from generated.schema.type.entityReference import EntityReference
+from mobigen.datafabric.client import json_codec
+from mobigen.datafabric.client.apis.async_apis import AsyncApis
+from mobigen.datafabric.client.apis.glossary_apis import GlossaryApis
 from mobigen.datafabric.client.apis.server_apis import ServerApis
 from mobigen.datafabric.client.auth_provider import AuthenticationProvider
 from mobigen.datafabric.client.client import Client, APIError
 from mobigen.datafabric.client.client_config import ClientConfig
-from mobigen.datafabric.client.models import EntityList
-from mobigen.datafabric.client.routes import ROUTES
+from mobigen.datafabric.client.models import EntityList, WriteResult
+from mobigen.datafabric.client.pagination import DEFAULT_PREFETCH, EntityStream, iterate_pages
+from mobigen.datafabric.client.routes import REGISTRY
 from mobigen.datafabric.client.server_config import ServerConnection
 from mobigen.datafabric.utils.logger import rest_logger
 from mobigen.datafabric.utils.utils import model_str, get_entity_type
@@ -64,6 +67,8 @@ class EmptyPayloadException(Exception):
 
 class APIS(
     ServerApis,
+    AsyncApis,
+    GlossaryApis,
 ):
     """
     Generic interface to the Data Fabric API
@@ -96,6 +101,13 @@ class APIS(
             auth_header="Authorization",
             extra_headers=self.config.extraHeaders,
             auth_token=self._auth_provider.get_access_token,
+            pool_connections=self.config.poolConnections,
+            pool_maxsize=self.config.poolMaxSize,
+            pool_block=self.config.poolBlock,
+            keep_alive_timeout=self.config.keepAliveTimeout,
+            max_rps=self.config.maxRps,
+            adaptive=self.config.adaptiveRate,
+            max_in_flight=self.config.maxInFlight,
         )
         self.client = Client(client_config)
         if self.config.enableVersionValidation:
@@ -109,7 +121,7 @@ class APIS(
         return the endpoint to run requests.
         """
 
-        route = ROUTES.get(entity.__name__)
+        route = REGISTRY.route(entity)
         if route is None:
             raise MissingEntityTypeException(
                 f"Missing {entity} type when generating suffixes"
@@ -128,9 +140,15 @@ class APIS(
     def get_create_entity_type(self, entity: Type[T]) -> Type[C]:
         """
         imports and returns the Create Type from an Entity Type T.
-        We are following the expected path structure to import
-        on-the-fly the necessary class and pass it to the consumer
+        Registered types are looked up in the registry, otherwise
+        we are following the expected path structure to import
+        on-the-fly the necessary class and pass it to the consumer,
+        the result is registered for the next calls
         """
+        create_class = REGISTRY.create_of(entity)
+        if create_class is not None:
+            return create_class
+
         file_name = f"create{entity.__name__}"
 
         class_path = ".".join(
@@ -141,6 +159,7 @@ class APIS(
         create_class = getattr(
             __import__(class_path, globals(), locals(), [class_name]), class_name
         )
+        REGISTRY.register_create(create_class, entity)
         return create_class
 
     @staticmethod
@@ -160,6 +179,9 @@ class APIS(
         """
         Inversely, import the Entity type based on the create Entity class
         """
+        entity_class = REGISTRY.entity_of(create)
+        if entity_class is not None:
+            return entity_class
 
         class_name = create.__name__.replace("Create", "").replace("Request", "")
         file_name = (
@@ -180,38 +202,72 @@ class APIS(
         entity_class = getattr(
             __import__(class_path, globals(), locals(), [class_name]), class_name
         )
+        REGISTRY.register_create(create, entity_class)
         return entity_class
 
-    def _create(self, data: C, method: str) -> T:
+    def get_create_response_type(self, create: Type[C]) -> Type[T]:
         """
-        Internal logic to run POST vs. PUT
+        Return the Entity type returned by a POST/PUT of the create request C
         """
-        entity = data.__class__
-        is_create = "create" in data.__class__.__name__.lower()
+        entity_class = REGISTRY.entity_of(create)
+        if entity_class is not None:
+            return entity_class
+
+        is_create = "create" in create.__name__.lower()
 
         # Prepare the return Entity Type
         if is_create:
-            entity_class = self.get_entity_from_create(entity)
-        else:
-            raise InvalidEntityException(
-                f"PUT operations need a CreateEntity, not {entity}"
-            )
+            return self.get_entity_from_create(create)
+        raise InvalidEntityException(
+            f"PUT operations need a CreateEntity, not {create}"
+        )
+
+    def _create(self, data: C, method: str, lean: bool = False) -> Union[T, WriteResult]:
+        """
+        Internal logic to run POST vs. PUT
+        With lean, only id/version/fqn are picked from the response instead of parsing the entity
+        """
+        entity = data.__class__
+        entity_class = self.get_create_response_type(entity)
 
         fn = getattr(self.client, method)
-        resp = fn(self.get_suffix(entity), data=data.json(encoder=pydantic_encoder))
+        resp = fn(self.get_suffix(entity), data=json_codec.encode_model(data))
         if not resp:
             raise EmptyPayloadException(
                 f"Got an empty response when trying to PUT to {self.get_suffix(entity)}, {data.json()}"
             )
+        if lean:
+            return WriteResult.from_response(resp)
         return entity_class(**resp)
 
-    def create_or_update(self, data: C) -> T:
+    def create_or_update(self, data: C, lean: bool = False) -> Union[T, WriteResult]:
         """Run a PUT requesting via create request C"""
-        return self._create(data=data, method="put")
+        return self._create(data=data, method="put", lean=lean)
 
-    def create(self, data: C) -> T:
+    def create(self, data: C, lean: bool = False) -> Union[T, WriteResult]:
         """Run a POST requesting via create request C"""
-        return self._create(data=data, method="post")
+        return self._create(data=data, method="post", lean=lean)
+
+    def patch(
+            self,
+            entity: Type[T],
+            entity_id: Union[str, basic.Uuid],
+            operations: List[dict],
+            lean: bool = False,
+    ) -> Union[T, WriteResult]:
+        """
+        Apply JSON Patch operations to the entity
+
+        :param operations: e.g. [{"op": "add", "path": "/synonyms/-", "value": "..."}]
+        :param lean: only pick id/version/fqn from the response, see _create
+        """
+        path = f"{self.get_suffix(entity)}/{model_str(entity_id)}"
+        resp = self.client.patch(path=path, data=json_codec.dumps(operations))
+        if not resp:
+            raise EmptyPayloadException(f"Got an empty response when trying to PATCH {path}")
+        if lean:
+            return WriteResult.from_response(resp)
+        return entity(**resp)
 
     def get_by_name(
             self,
@@ -308,6 +364,36 @@ class APIS(
         logger.debug("Cannot find the Entity %s", fqn)
         return None
 
+    def _list_path(
+            self,
+            entity: Type[T],
+            fields: Optional[List[str]] = None,
+            after: Optional[str] = None,
+            limit: int = 100,
+    ) -> str:
+        suffix = self.get_suffix(entity)
+        url_limit = f"?limit={limit}"
+        url_after = f"&after={after}" if after else ""
+        url_fields = f"&fields={','.join(fields)}" if fields else ""
+        return f"{suffix}{url_limit}{url_after}{url_fields}"
+
+    @staticmethod
+    def _parse_entities(entity: Type[T], elements: Iterable[dict], skip_on_failure: bool) -> Iterable[T]:
+        if not skip_on_failure:
+            for elmt in elements:
+                yield entity(**elmt)
+            return
+        for elmt in elements:
+            try:
+                yield entity(**elmt)
+            except Exception as exc:
+                logger.error(
+                    f"Error creating entity [{entity.__name__}]. Failed with exception {exc}"
+                )
+                logger.debug(
+                    f"Can't create [{entity.__name__}] from [{elmt}]. Skipping."
+                )
+
     # pylint: disable=too-many-locals
     def list_entities(
             self,
@@ -322,34 +408,41 @@ class APIS(
         Helps us paginate over the collection
         """
 
-        suffix = self.get_suffix(entity)
-        url_limit = f"?limit={limit}"
-        url_after = f"&after={after}" if after else ""
-        url_fields = f"&fields={','.join(fields)}" if fields else ""
         resp = self.client.get(
-            path=f"{suffix}{url_limit}{url_after}{url_fields}", data=params
+            path=self._list_path(entity, fields, after, limit), data=params
         )
 
-        if skip_on_failure:
-            entities = []
-            for elmt in resp["data"]:
-                try:
-                    entities.append(entity(**elmt))
-                except Exception as exc:
-                    logger.error(
-                        f"Error creating entity [{entity.__name__}]. Failed with exception {exc}"
-                    )
-                    logger.debug(
-                        f"Can't create [{entity.__name__}] from [{elmt}]. Skipping."
-                    )
-                    continue
-        else:
-            entities = [entity(**elmt) for elmt in resp["data"]]
-
+        entities = list(self._parse_entities(entity, resp["data"], skip_on_failure))
         total = resp["paging"]["total"]
         after = resp["paging"]["after"] if "after" in resp["paging"] else None
         return EntityList(entities=entities, total=total, after=after)
 
+    def stream_entities(
+            self,
+            entity: Type[T],
+            fields: Optional[List[str]] = None,
+            after: Optional[str] = None,
+            limit: int = 100,
+            params: Optional[Dict[str, str]] = None,
+            skip_on_failure: bool = False,
+    ) -> EntityStream[T]:
+        """
+        Same page as list_entities, the entities are decoded one at a time from the response stream
+        instead of holding the whole body, its json and the entity list in memory.
+        total and after are set once the stream is consumed.
+        """
+
+        resp = self.client.get_stream(
+            path=self._list_path(entity, fields, after, limit), data=params
+        )
+        if resp is None:
+            raise EmptyPayloadException(f"Got an empty response when trying to list {entity.__name__}")
+
+        def decode(elements: Iterable[dict]) -> Iterable[T]:
+            return self._parse_entities(entity, elements, skip_on_failure)
+
+        return EntityStream(resp, decode)
+
     def list_all_entities(
             self,
             entity: Type[T],
@@ -357,6 +450,8 @@ class APIS(
             limit: int = 100,
             params: Optional[Dict[str, str]] = None,
             skip_on_failure: bool = False,
+            prefetch: int = DEFAULT_PREFETCH,
+            stream: bool = False,
     ) -> Iterable[T]:
         """
         Utility method that paginates over all EntityLists
@@ -365,23 +460,30 @@ class APIS(
         :param fields: Extra fields to return
         :param limit: Number of entities in each pagination
         :param params: Extra parameters, e.g., {"service": "serviceName"} to filter
+        :param prefetch: Number of pages fetched ahead in a background thread, 0 to fetch them one by one
+        :param stream: Decode the entities from the response streams (see stream_entities),
+            the pages are fetched one by one
         :return: Generator that will be yielding all Entities
         """
 
-        # First batch of Entities
-        entity_list = self.list_entities(
-            entity=entity,
-            fields=fields,
-            limit=limit,
-            params=params,
-            skip_on_failure=skip_on_failure,
-        )
-        for elem in entity_list.entities:
-            yield elem
+        if stream:
+            after = None
+            while True:
+                page = self.stream_entities(
+                    entity=entity,
+                    fields=fields,
+                    limit=limit,
+                    params=params,
+                    after=after,
+                    skip_on_failure=skip_on_failure,
+                )
+                yield from page
+                after = page.after
+                if not after:
+                    return
 
-        after = entity_list.after
-        while after:
-            entity_list = self.list_entities(
+        def fetch(after: Optional[str]) -> EntityList[T]:
+            return self.list_entities(
                 entity=entity,
                 fields=fields,
                 limit=limit,
@@ -389,9 +491,9 @@ class APIS(
                 after=after,
                 skip_on_failure=skip_on_failure,
             )
-            for elem in entity_list.entities:
-                yield elem
-            after = entity_list.after
+
+        for entity_list in iterate_pages(fetch, prefetch=prefetch):
+            yield from entity_list.entities
 
     def delete(
             self,
@@ -430,3 +532,4 @@ class APIS(
             None
         """
         self.client.close()
+        # the async client is closed with aclose() inside its event loop
@@ -0,0 +1,146 @@
+#  Copyright 2021 Collate
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#  http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+Mixin class containing the asyncio variants of the generic entity methods
+
+To be used by APIS class
+"""
+import traceback
+from typing import List, Optional, Type, TypeVar, Union
+
+from pydantic.v1 import BaseModel
+from requests.compat import quote
+
+from generated.schema.type import basic
+from generated.schema.type.basic import FullyQualifiedEntityName
+from mobigen.datafabric.client import json_codec
+from mobigen.datafabric.client.client import Client, APIError
+from mobigen.datafabric.client.models import WriteResult
+from mobigen.datafabric.utils.logger import rest_logger
+from mobigen.datafabric.utils.utils import model_str
+
+logger = rest_logger()
+
+T = TypeVar("T", bound=BaseModel)
+C = TypeVar("C", bound=BaseModel)
+
+
+class AsyncApis:
+    """
+    Data Fabric API methods running on AsyncClient.
+
+    The AsyncClient is created on first use from the configuration of the
+    blocking client, so both share the same server, auth and retry settings.
+
+    To be inherited by APIS
+    """
+
+    client: Client
+    _async_client = None
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            # aiohttp is only needed by the async methods
+            from mobigen.datafabric.client.async_client import AsyncClient
+
+            self._async_client = AsyncClient(self.client.config)
+        return self._async_client
+
+    async def _acreate(self, data: C, method: str, lean: bool = False) -> Union[T, WriteResult]:
+        """
+        Internal logic to run POST vs. PUT, see APIS._create
+        """
+        entity = data.__class__
+        entity_class = self.get_create_response_type(entity)
+
+        fn = getattr(self.async_client, method)
+        resp = await fn(self.get_suffix(entity), data=json_codec.encode_model(data))
+        if not resp:
+            # api.py imports this mixin
+            from mobigen.datafabric.client.api import EmptyPayloadException
+
+            raise EmptyPayloadException(
+                f"Got an empty response when trying to PUT to {self.get_suffix(entity)}, {data.json()}"
+            )
+        if lean:
+            return WriteResult.from_response(resp)
+        return entity_class(**resp)
+
+    async def acreate_or_update(self, data: C, lean: bool = False) -> Union[T, WriteResult]:
+        """Run a PUT requesting via create request C"""
+        return await self._acreate(data=data, method="put", lean=lean)
+
+    async def acreate(self, data: C, lean: bool = False) -> Union[T, WriteResult]:
+        """Run a POST requesting via create request C"""
+        return await self._acreate(data=data, method="post", lean=lean)
+
+    async def apatch(
+            self,
+            entity: Type[T],
+            entity_id: Union[str, basic.Uuid],
+            operations: List[dict],
+            lean: bool = False,
+    ) -> Union[T, WriteResult]:
+        """
+        Apply JSON Patch operations to the entity, see APIS.patch
+        """
+        path = f"{self.get_suffix(entity)}/{model_str(entity_id)}"
+        resp = await self.async_client.patch(path=path, data=json_codec.dumps(operations))
+        if not resp:
+            from mobigen.datafabric.client.api import EmptyPayloadException
+
+            raise EmptyPayloadException(f"Got an empty response when trying to PATCH {path}")
+        if lean:
+            return WriteResult.from_response(resp)
+        return entity(**resp)
+
+    async def aget_by_name(
+            self,
+            entity: Type[T],
+            fqn: Union[str, FullyQualifiedEntityName],
+            fields: Optional[List[str]] = None,
+            nullable: bool = True,
+    ) -> Optional[T]:
+        """
+        Return entity by name or None
+        """
+        path = f"name/{quote(model_str(fqn), safe='')}"
+        fields_str = "?fields=" + ",".join(fields) if fields else ""
+        try:
+            resp = await self.async_client.get(f"{self.get_suffix(entity)}/{path}{fields_str}")
+            if not resp:
+                from mobigen.datafabric.client.api import EmptyPayloadException
+
+                raise EmptyPayloadException(
+                    f"Got an empty response when trying to GET from {self.get_suffix(entity)}/{path}{fields_str}"
+                )
+            return entity(**resp)
+        except APIError as err:
+            if err.code == 404 and nullable:
+                return None
+
+            logger.debug(traceback.format_exc())
+            logger.debug(
+                "GET %s for %s. Error %s - %s",
+                entity.__name__,
+                path,
+                err.status_code,
+                err,
+            )
+            raise err
+
+    async def aclose(self):
+        """
+        Closing the async connection
+        """
+        if self._async_client is not None:
+            await self._async_client.close()
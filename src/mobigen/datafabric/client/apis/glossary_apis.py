@@ -9,300 +9,47 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 """
-Mixin class containing Table specific methods
+Mixin class containing Glossary specific methods
 
-To be used by OpenMetadata class
+To be used by APIS class
 """
-import traceback
-from typing import List, Optional, Type, TypeVar
-
-from pydantic.v1 import BaseModel
 from requests.compat import quote
 
-from generated.schema.api.data. import (
-    CreateTableProfileRequest,
-)
-from metadata.generated.schema.api.tests.createCustomMetric import (
-    CreateCustomMetricRequest,
-)
-from metadata.generated.schema.entity.data.table import (
-    ColumnProfile,
-    DataModel,
-    SystemProfile,
-    Table,
-    TableData,
-    TableJoins,
-    TableProfile,
-    TableProfilerConfig,
-)
-from metadata.generated.schema.type.basic import FullyQualifiedEntityName, Uuid
-from metadata.generated.schema.type.usageRequest import UsageRequest
-from metadata.ingestion.ometa.client import REST
-from metadata.ingestion.ometa.models import EntityList
-from metadata.ingestion.ometa.utils import model_str
-from metadata.utils.logger import ometa_logger
-
-logger = ometa_logger()
+from generated.schema.entity.data.glossary import Glossary
+from generated.schema.type.csvImportResult import CsvImportResult
+from mobigen.datafabric.client.client import Client
+from mobigen.datafabric.utils.logger import rest_logger
 
-LRU_CACHE_SIZE = 4096
-T = TypeVar("T", bound=BaseModel)
+logger = rest_logger()
 
 
-class OMetaTableMixin:
+class GlossaryApis:
     """
-    OpenMetadata API methods related to Tables.
+    Data Fabric API methods related to Glossaries
 
-    To be inherited by OpenMetadata
+    To be inherited by APIS
     """
 
-    client: REST
-
-    def ingest_table_sample_data(
-        self, table: Table, sample_data: TableData
-    ) -> Optional[TableData]:
-        """
-        PUT sample data for a table
-
-        :param table: Table Entity to update
-        :param sample_data: Data to add
-        """
-        resp = None
-        try:
-            resp = self.client.put(
-                f"{self.get_suffix(Table)}/{table.id.__root__}/sampleData",
-                data=sample_data.json(),
-            )
-        except Exception as exc:
-            logger.debug(traceback.format_exc())
-            logger.warning(
-                f"Error trying to PUT sample data for {table.fullyQualifiedName.__root__}: {exc}"
-            )
-
-        if resp:
-            try:
-                return TableData(**resp["sampleData"])
-            except UnicodeError as err:
-                logger.debug(traceback.format_exc())
-                logger.warning(
-                    f"Unicode Error parsing the sample data response from {table.fullyQualifiedName.__root__}: {err}"
-                )
-            except Exception as exc:
-                logger.debug(traceback.format_exc())
-                logger.warning(
-                    f"Error trying to parse sample data results from {table.fullyQualifiedName.__root__}: {exc}"
-                )
-
-        return None
-
-    def get_sample_data(self, table: Table) -> Optional[Table]:
-        """
-        GET call for the /sampleData endpoint for a given Table
-
-        Returns a Table entity with TableData (sampleData informed)
-        """
-        resp = None
-        try:
-            resp = self.client.get(
-                f"{self.get_suffix(Table)}/{table.id.__root__}/sampleData",
-            )
-        except Exception as exc:
-            logger.debug(traceback.format_exc())
-            logger.warning(
-                f"Error trying to GET sample data for {table.fullyQualifiedName.__root__}: {exc}"
-            )
-
-        if resp:
-            try:
-                return Table(**resp)
-            except UnicodeError as err:
-                logger.debug(traceback.format_exc())
-                logger.warning(
-                    f"Unicode Error parsing the sample data response from {table.fullyQualifiedName.__root__}: {err}"
-                )
-            except Exception as exc:
-                logger.debug(traceback.format_exc())
-                logger.warning(
-                    f"Error trying to parse sample data results from {table.fullyQualifiedName.__root__}: {exc}"
-                )
-
-        return None
-
-    def ingest_profile_data(
-        self, table: Table, profile_request: CreateTableProfileRequest
-    ) -> Table:
-        """
-        PUT profile data for a table
-
-        :param table: Table Entity to update
-        :param table_profile: Profile data to add
-        """
-        resp = self.client.put(
-            f"{self.get_suffix(Table)}/{table.id.__root__}/tableProfile",
-            data=profile_request.json(),
-        )
-        return Table(**resp)
-
-    def ingest_table_data_model(self, table: Table, data_model: DataModel) -> Table:
-        """
-        PUT data model for a table
-
-        :param table: Table Entity to update
-        :param data_model: Model to add
-        """
-        resp = self.client.put(
-            f"{self.get_suffix(Table)}/{table.id.__root__}/dataModel",
-            data=data_model.json(),
-        )
-        return Table(**resp)
-
-    def publish_table_usage(
-        self, table: Table, table_usage_request: UsageRequest
-    ) -> None:
-        """
-        POST usage details for a Table
-
-        :param table: Table Entity to update
-        :param table_usage_request: Usage data to add
-        """
-        resp = self.client.post(
-            f"/usage/table/{table.id.__root__}", data=table_usage_request.json()
-        )
-        logger.debug("published table usage %s", resp)
-
-    def publish_frequently_joined_with(
-        self, table: Table, table_join_request: TableJoins
-    ) -> None:
-        """
-        POST frequently joined with for a table
+    client: Client
 
-        :param table: Table Entity to update
-        :param table_join_request: Join data to add
+    def import_glossary_csv(self, name: str, csv_text: str, dry_run: bool = True) -> CsvImportResult:
         """
+        PUT glossary terms in the server CSV import format to /glossaries/name/{name}/import
 
-        logger.info("table join request %s", table_join_request.json())
-        resp = self.client.put(
-            f"{self.get_suffix(Table)}/{table.id.__root__}/joins",
-            data=table_join_request.json(),
-        )
-        logger.debug("published frequently joined with %s", resp)
-
-    def _create_or_update_table_profiler_config(
-        self,
-        table_id: Uuid,
-        table_profiler_config: TableProfilerConfig,
-    ):
-        """create or update profler config
-
-        Args:
-            table: table entity
-            table_profiler_config: profiler config object,
-            path: tableProfilerConfig
-
-        Returns:
-
+        :param name: glossary name
+        :param csv_text: header and term rows
+        :param dry_run: only validate the rows, nothing is stored
+        :return: import status and the per-row results (importResultsCsv)
         """
+        path = f"{self.get_suffix(Glossary)}/name/{quote(name, safe='')}/import?dryRun={str(dry_run).lower()}"
         resp = self.client.put(
-            f"{self.get_suffix(Table)}/{model_str(table_id)}/tableProfilerConfig",
-            data=table_profiler_config.json(),
+            path,
+            data=csv_text.encode("utf-8"),
+            headers={"Content-type": "text/plain; charset=utf-8"},
         )
-        return Table(**resp)
-
-    def create_or_update_table_profiler_config(
-        self, fqn: str, table_profiler_config: TableProfilerConfig
-    ) -> Optional[Table]:
-        """
-        Update the profileSample property of a Table, given
-        its FQN.
-
-        :param fqn: Table FQN
-        :param profile_sample: new profile sample to set
-        :return: Updated table
-        """
-        table = self.get_by_name(entity=Table, fqn=fqn)
-        if table:
-            return self._create_or_update_table_profiler_config(
-                table.id,
-                table_profiler_config=table_profiler_config,
-            )
-
-        return None
-
-    def get_profile_data(
-        self,
-        fqn: str,
-        start_ts: int,
-        end_ts: int,
-        limit=100,
-        after=None,
-        profile_type: Type[T] = TableProfile,
-    ) -> EntityList[T]:
-        """Get profile data
-
-        Args:
-            fqn (str): fullyQualifiedName
-            start_ts (int): start timestamp
-            end_ts (int): end timestamp
-            limit (int, optional): limit of record to return. Defaults to 100.
-            after (_type_, optional): use for API pagination. Defaults to None.
-            profile_type (Union[Type[TableProfile], Type[ColumnProfile]], optional):
-                Profile type to retrieve. Defaults to TableProfile.
-
-        Raises:
-            TypeError: if `profile_type` is not TableProfile or ColumnProfile
+        if not resp:
+            # api.py imports this mixin
+            from mobigen.datafabric.client.api import EmptyPayloadException
 
-        Returns:
-            EntityList: EntityList list object
-        """
-
-        url_after = f"&after={after}" if after else ""
-        profile_type_url = profile_type.__name__[0].lower() + profile_type.__name__[1:]
-
-        resp = self.client.get(
-            f"{self.get_suffix(Table)}/{fqn}/{profile_type_url}?limit={limit}{url_after}",
-            data={"startTs": start_ts, "endTs": end_ts},
-        )
-
-        if profile_type in (TableProfile, SystemProfile):
-            data: List[T] = [profile_type(**datum) for datum in resp["data"]]  # type: ignore
-        elif profile_type is ColumnProfile:
-            split_fqn = fqn.split(".")
-            if len(split_fqn) < 5:
-                raise ValueError(f"{fqn} is not a column fqn")
-            data: List[T] = [ColumnProfile(**datum) for datum in resp["data"]]  # type: ignore
-        else:
-            raise TypeError(
-                f"{profile_type} is not an accepeted type."
-                "Type must be `TableProfile` or `ColumnProfile`"
-            )
-        total = resp["paging"]["total"]
-        after = resp["paging"]["after"] if "after" in resp["paging"] else None
-
-        return EntityList(entities=data, total=total, after=after)
-
-    def get_latest_table_profile(
-        self, fqn: FullyQualifiedEntityName
-    ) -> Optional[Table]:
-        """Get the latest profile data for a table
-
-        Args:
-            fqn (str): table fully qualified name
-
-        Returns:
-            Optional[Table]: OM table object
-        """
-        return self._get(Table, f"{quote(model_str(fqn))}/tableProfile/latest")
-
-    def create_or_update_custom_metric(
-        self, custom_metric: CreateCustomMetricRequest, table_id: str
-    ) -> Table:
-        """Create or update custom metric. If custom metric name matches an existing
-        one then it will be updated.
-
-        Args:
-            custom_metric (CreateCustomMetricRequest): custom metric to be create or updated
-        """
-        resp = self.client.put(
-            f"{self.get_suffix(Table)}/{table_id}/customMetric",
-            data=custom_metric.json(),
-        )
-        return Table(**resp)
+            raise EmptyPayloadException(f"Got an empty response when trying to PUT to {path}")
+        return CsvImportResult.parse_obj(resp)
@@ -0,0 +1,219 @@
+import asyncio
+import time
+import traceback
+from typing import Dict, Optional
+
+import aiohttp
+
+from mobigen.datafabric.client import json_codec
+from mobigen.datafabric.client.client import APIError, RequestPreparation, RetryException
+from mobigen.datafabric.client.client_config import ClientConfig
+from mobigen.datafabric.client.client_util import URL, get_api_version
+from mobigen.datafabric.client.rate_control import RateController
+from mobigen.datafabric.client.retry_policy import RetryPolicy, parse_retry_after
+from mobigen.datafabric.utils.logger import rest_logger
+
+logger = rest_logger()
+
+
+class AsyncClient(RequestPreparation):
+    """
+    asyncio counterpart of Client.
+    Same get/post/put/patch/delete surface, retry and auth semantics, but every method is a coroutine
+    and all requests share one aiohttp session, so many requests can be in flight on a single thread.
+    """
+
+    def __init__(self, config: ClientConfig):
+        self.config = config
+        self._base_url: URL = URL(self.config.base_url)
+        self._api_version = get_api_version(self.config.api_version)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._retry = self.config.retry
+        self._retry_wait = self.config.retry_wait
+        self._retry_codes = self.config.retry_codes
+        self._retry_policy = RetryPolicy(
+            retries=self._retry,
+            base_wait=self.config.retry_base_wait,
+            max_wait=self._retry_wait,
+            max_elapsed=self.config.retry_max_elapsed,
+            retry_codes=self._retry_codes,
+        )
+        self._auth_token = self.config.auth_token
+        self._auth_token_mode = self.config.auth_token_mode
+        self._url_prefix = f"{self._base_url}/{self._api_version}"
+        # Built from the access token of the config by _refresh_token or _prepare
+        self._default_headers: Optional[Dict[str, str]] = None
+        self._headers_token: Optional[str] = None
+        self._rate = RateController(
+            max_rps=self.config.max_rps,
+            adaptive=self.config.adaptive,
+            max_in_flight=self.config.max_in_flight,
+            overload_codes=self._retry_codes,
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # aiohttp sessions must be created inside the running event loop
+        if self._session is None or self._session.closed:
+            connector_opts = {
+                "limit": self.config.pool_connections * self.config.pool_maxsize,
+                "limit_per_host": self.config.pool_maxsize,
+            }
+            if self.config.keep_alive_timeout:
+                connector_opts["keepalive_timeout"] = self.config.keep_alive_timeout
+            connector = aiohttp.TCPConnector(**connector_opts)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def _request(
+        self,
+        method,
+        path,
+        data=None,
+        base_url: URL = None,
+        api_version: str = None,
+        headers: dict = None,
+    ):
+        if self._token_expired():
+            self._refresh_token()
+        url, headers = self._prepare(path, base_url, api_version, headers)
+
+        opts = {
+            "headers": headers,
+        }
+
+        method_key = "params" if method.upper() == "GET" else "data"
+        opts[method_key] = data
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await self._one_request(method, url, opts, attempt < self._retry_policy.retries)
+            except RetryException as exc:
+                retry_wait = self._retry_policy.next_wait(attempt, time.monotonic() - started, exc.retry_after)
+                if retry_wait is None:
+                    logger.error(f"No more retries left for {url}")
+                    if exc.error is not None:
+                        raise exc.error
+                    return None
+                attempt += 1
+                logger.warning(
+                    "sleep %.2f seconds and retrying %s (retry %s of %s)...",
+                    retry_wait,
+                    url,
+                    attempt,
+                    self._retry_policy.retries,
+                )
+                await asyncio.sleep(retry_wait)
+
+    async def _one_request(self, method: str, url: URL, opts: dict, retry: bool):
+        """
+        Perform one request, possibly raising RetryException in the case
+        the response is 429/504 or the connection failed, and the retry policy allows it.
+        Otherwise, if error text contain "code" string,
+        then it decodes to json object and returns APIError.
+        Returns the body json in the 200 status.
+        """
+        try:
+            async with self._rate.async_slot() as permit, \
+                    self._get_session().request(method, url, **opts) as resp:
+                permit.observe(resp.status)
+                body = await resp.read()
+                try:
+                    resp.raise_for_status()
+                except aiohttp.ClientResponseError as http_error:
+                    error = http_error
+                    if b"code" in body:
+                        error_body = json_codec.loads(body)
+                        error = APIError(error_body, http_error) if "code" in error_body else None
+                    # retry if we hit Rate Limit
+                    if retry and self._retry_policy.should_retry(method, resp.status):
+                        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                        raise RetryException(error, retry_after) from http_error
+                    if isinstance(error, APIError):
+                        raise error from http_error
+                    if error is not None:
+                        raise
+                    return None
+
+                if body:
+                    try:
+                        return json_codec.loads(body)
+                    except Exception as exc:
+                        logger.debug(traceback.format_exc())
+                        logger.warning(
+                            f"Unexpected error while returning response {resp} in json format - {exc}"
+                        )
+        except (RetryException, APIError, aiohttp.ClientResponseError):
+            raise
+        except aiohttp.ClientConnectionError as conn:
+            # Dropped keep-alive connections, see Client._one_request
+            if retry and self._retry_policy.should_retry(method):
+                raise RetryException(conn) from conn
+            raise
+        except Exception as exc:
+            logger.debug(traceback.format_exc())
+            logger.warning(
+                f"Unexpected error calling [{url}] with method [{method}]: {exc}"
+            )
+
+        return None
+
+    async def get(self, path, data=None):
+        """
+        GET method
+        """
+        return await self._request("GET", path, data)
+
+    async def post(self, path, data=None):
+        """
+        POST method
+        """
+        return await self._request("POST", path, data)
+
+    async def put(self, path, data=None):
+        """
+        PUT method
+        """
+        return await self._request("PUT", path, data)
+
+    async def patch(self, path, data=None):
+        """
+        PATCH method
+        """
+        return await self._request(
+            method="PATCH",
+            path=path,
+            data=data,
+            headers={"Content-type": "application/json-patch+json"},
+        )
+
+    async def delete(self, path, data=None):
+        """
+        DELETE method
+        """
+        return await self._request("DELETE", path, data)
+
+    async def prewarm(self, connections: int, path: str = "/system/version"):
+        """
+        Open connections to the server before a burst of requests. See Client.prewarm
+        """
+        connections = min(connections, self.config.pool_maxsize)
+        if connections <= 0:
+            return
+        await asyncio.gather(*[self.get(path) for _ in range(connections)])
+        logger.debug(f"Pre-warmed {connections} connection(s)")
+
+    async def __aenter__(self):
+        return self
+
+    async def close(self):
+        """
+        Close aiohttp session
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
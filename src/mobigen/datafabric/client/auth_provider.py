@@ -1,14 +1,31 @@
-from datetime import datetime
-
-from dateutil.relativedelta import relativedelta
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Optional
 
 SECRET = "secret:"
 
 
+def jwt_expiry(jwt_token: str) -> Optional[datetime]:
+    """
+    Expiry from the exp claim of the JWT payload. The signature is not verified, the server does it.
+    None when the token has no exp claim (e.g. a bot token that does not expire) or is not a JWT.
+    """
+    try:
+        payload = jwt_token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        exp = claims.get("exp")
+    except (IndexError, ValueError, AttributeError):
+        return None
+    if exp is None:
+        return None
+    return datetime.fromtimestamp(exp, tz=timezone.utc)
+
+
 class AuthenticationProvider:
     def __init__(self, jwt_token: str):
         self.jwt_token = jwt_token.replace(SECRET, "")
-        self.expiry = datetime.now() - relativedelta(years=1)
+        self.expiry = jwt_expiry(self.jwt_token)
 
     @classmethod
     def create(cls, jwt_token: str):
@@ -1,23 +1,40 @@
 import datetime
+import socket
+import threading
 import time
 import traceback
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
+from urllib3.connection import HTTPConnection
 
+from mobigen.datafabric.client import json_codec
 from mobigen.datafabric.client.client_config import ClientConfig
 from mobigen.datafabric.client.client_util import URL, get_api_version
+from mobigen.datafabric.client.rate_control import RateController
+from mobigen.datafabric.client.retry_policy import RetryPolicy, parse_retry_after
 from mobigen.datafabric.utils.logger import rest_logger
 
 logger = rest_logger()
 
+# Seconds before its expiry a token is refreshed
+TOKEN_EXPIRY_MARGIN = 120
+
 
 class RetryException(Exception):
     """
     API Client retry exception
+    error is raised instead when no retry is left, retry_after comes from the Retry-After header
     """
 
+    def __init__(self, error: Optional[Exception] = None, retry_after: Optional[float] = None):
+        super().__init__(str(error) if error is not None else "")
+        self.error = error
+        self.retry_after = retry_after
+
 
 class APIError(Exception):
     """
@@ -48,6 +65,9 @@ class APIError(Exception):
         http_error = self._http_error
         if http_error is not None and hasattr(http_error, "response"):
             return http_error.response.status_code
+        if http_error is not None and hasattr(http_error, "status"):
+            # aiohttp.ClientResponseError raised by AsyncClient
+            return http_error.status
 
         return None
 
@@ -57,7 +77,7 @@ class APIError(Exception):
         Handle requests error
         """
         if self._http_error is not None:
-            return self._http_error.request
+            return getattr(self._http_error, "request", None)
 
         return None
 
@@ -68,22 +88,161 @@ class APIError(Exception):
         :return:
         """
         if self._http_error is not None:
-            return self._http_error.response
+            return getattr(self._http_error, "response", None)
 
         return None
 
 
-class Client:
+def keep_alive_socket_options(keep_alive_timeout: Optional[int]) -> List[Tuple[int, int, int]]:
+    """
+    Socket options enabling TCP keep-alive probes after keep_alive_timeout idle seconds
+    """
+    options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, keep_alive_timeout))
+    elif hasattr(socket, "TCP_KEEPALIVE"):
+        # macOS
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, keep_alive_timeout))
+    return options
+
+
+class PoolAdapter(HTTPAdapter):
+    """
+    HTTPAdapter passing TCP keep-alive socket options to its connection pools
+    """
+
+    def __init__(self, keep_alive_timeout: Optional[int] = None, **kwargs):
+        self.socket_options = keep_alive_socket_options(keep_alive_timeout) if keep_alive_timeout else None
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options:
+            kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+class RequestPreparation:
+    """
+    Auth token caching and request headers/URL building shared by Client and AsyncClient
+    """
+
+    config: ClientConfig
+    _base_url: URL
+    _api_version: str
+    _url_prefix: str
+    _default_headers: Optional[Dict[str, str]]
+    _headers_token: Optional[str]
+
+    def _refresh_token(self):
+        """
+        Fetch a new access token and rebuild the default headers carrying it.
+        The token is kept in the config, which may be shared with another client.
+        The token is then reused until TOKEN_EXPIRY_MARGIN seconds before its expiry,
+        a token without expiry is kept for the life of the client.
+        """
+        access_token, expiry = self._auth_token()
+        if access_token != "no_token":
+            if isinstance(expiry, datetime.datetime):
+                self.config.expires_in = expiry.timestamp() - TOKEN_EXPIRY_MARGIN
+            elif expiry is not None:
+                self.config.expires_in = time.time() + expiry - TOKEN_EXPIRY_MARGIN
+            else:
+                self.config.expires_in = None
+        self.config.access_token = access_token
+        self._rebuild_headers(access_token)
+
+    def _rebuild_headers(self, access_token: str):
+        self._default_headers = self._build_headers(access_token)
+        self._headers_token = access_token
+
+    def _build_headers(self, access_token: str) -> Dict[str, str]:
+        headers = {"Content-type": "application/json"}
+        headers[self.config.auth_header] = (
+            f"{self._auth_token_mode} {access_token}"
+            if self._auth_token_mode
+            else access_token
+        )
+
+        # Merge extra headers if provided.
+        # If a header value is provided in modulo string format and matches an existing header,
+        # the value will be set to that value.
+        # Example: "Proxy-Authorization": "%(Authorization)s"
+        # This will result in the Authorization value being set for the Proxy-Authorization Extra Header
+        if self.config.extra_headers:
+            extra_headers: Dict[str, str] = self.config.extra_headers
+            extra_headers = {k: (v % headers) for k, v in extra_headers.items()}
+            headers = {**headers, **extra_headers}
+        return headers
+
+    def _prepare(self,
+                 path: str,
+                 base_url: URL = None,
+                 api_version: str = None,
+                 headers: dict = None) -> Tuple[str, Dict[str, str]]:
+        """
+        URL and headers of a request. The default headers and URL prefix are built once,
+        the headers dict is shared by the requests and must not be modified.
+        They are rebuilt when the token of the config was refreshed by another client sharing it.
+        """
+        access_token = self.config.access_token
+        if access_token != self._headers_token:
+            self._rebuild_headers(access_token)
+        if headers:
+            headers = {**self._default_headers, **headers}
+        else:
+            headers = self._default_headers
+        if base_url or api_version:
+            url = URL((base_url or self._base_url) + "/" + (api_version or self._api_version) + path)
+        else:
+            url = self._url_prefix + path
+        return url, headers
+
+    def _token_expired(self) -> bool:
+        return (
+            self.config.expires_in
+            and time.time() >= self.config.expires_in
+            or not self.config.access_token
+        )
+
+
+class Client(RequestPreparation):
     def __init__(self, config: ClientConfig):
         self.config = config
         self._base_url: URL = URL(self.config.base_url)
         self._api_version = get_api_version(self.config.api_version)
         self._session = requests.Session()
+        adapter = PoolAdapter(
+            keep_alive_timeout=self.config.keep_alive_timeout,
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
         self._retry = self.config.retry
         self._retry_wait = self.config.retry_wait
         self._retry_codes = self.config.retry_codes
+        self._retry_policy = RetryPolicy(
+            retries=self._retry,
+            base_wait=self.config.retry_base_wait,
+            max_wait=self._retry_wait,
+            max_elapsed=self.config.retry_max_elapsed,
+            retry_codes=self._retry_codes,
+        )
         self._auth_token = self.config.auth_token
         self._auth_token_mode = self.config.auth_token_mode
+        self._url_prefix = f"{self._base_url}/{self._api_version}"
+        # Built from the access token of the config by _refresh_token or _prepare
+        self._default_headers: Optional[Dict[str, str]] = None
+        self._headers_token: Optional[str] = None
+        # The client may be shared by several upload threads, refresh the token once at a time
+        self._auth_lock = threading.Lock()
+        self._rate = RateController(
+            max_rps=self.config.max_rps,
+            adaptive=self.config.adaptive,
+            max_in_flight=self.config.max_in_flight,
+            overload_codes=self._retry_codes,
+        )
 
     def _request(
         self,
@@ -93,42 +252,13 @@ class Client:
         base_url: URL = None,
         api_version: str = None,
         headers: dict = None,
+        stream: bool = False,
     ):
-        # pylint: disable=too-many-locals
-        if not headers:
-            headers = {"Content-type": "application/json"}
-        base_url = base_url or self._base_url
-        version = api_version if api_version else self._api_version
-        url: URL = URL(base_url + "/" + version + path)
-        if (
-            self.config.expires_in
-            and datetime.datetime.utcnow().timestamp() >= self.config.expires_in
-            or not self.config.access_token
-        ):
-            self.config.access_token, expiry = self._auth_token()
-            if not self.config.access_token == "no_token":
-                if isinstance(expiry, datetime.datetime):
-                    self.config.expires_in = expiry.timestamp() - 120
-                else:
-                    self.config.expires_in = (
-                        datetime.datetime.utcnow().timestamp() + expiry - 120
-                    )
-
-        headers[self.config.auth_header] = (
-            f"{self._auth_token_mode} {self.config.access_token}"
-            if self._auth_token_mode
-            else self.config.access_token
-        )
-
-        # Merge extra headers if provided.
-        # If a header value is provided in modulo string format and matches an existing header,
-        # the value will be set to that value.
-        # Example: "Proxy-Authorization": "%(Authorization)s"
-        # This will result in the Authorization value being set for the Proxy-Authorization Extra Header
-        if self.config.extra_headers:
-            extra_headers: Dict[str, str] = self.config.extra_headers
-            extra_headers = {k: (v % headers) for k, v in extra_headers.items()}
-            headers = {**headers, **extra_headers}
+        if self._token_expired():
+            with self._auth_lock:
+                if self._token_expired():
+                    self._refresh_token()
+        url, headers = self._prepare(path, base_url, api_version, headers)
 
         opts = {
             "headers": headers,
@@ -136,42 +266,50 @@ class Client:
 
         method_key = "params" if method.upper() == "GET" else "data"
         opts[method_key] = data
+        if stream:
+            opts["stream"] = True
 
-        total_retries = self._retry if self._retry > 0 else 0
-        retry = total_retries
-        while retry >= 0:
+        started = time.monotonic()
+        attempt = 0
+        while True:
             try:
-                return self._one_request(method, url, opts, retry)
-            except RetryException:
-                retry_wait = self._retry_wait * (total_retries - retry + 1)
+                return self._one_request(method, url, opts, attempt < self._retry_policy.retries)
+            except RetryException as exc:
+                retry_wait = self._retry_policy.next_wait(attempt, time.monotonic() - started, exc.retry_after)
+                if retry_wait is None:
+                    logger.error(f"No more retries left for {url}")
+                    if exc.error is not None:
+                        raise exc.error
+                    return None
+                attempt += 1
                 logger.warning(
-                    "sleep %s seconds and retrying %s %s more time(s)...",
+                    "sleep %.2f seconds and retrying %s (retry %s of %s)...",
                     retry_wait,
                     url,
-                    retry,
+                    attempt,
+                    self._retry_policy.retries,
                 )
                 time.sleep(retry_wait)
-                retry -= 1
-                if retry == 0:
-                    logger.error(f"No more retries left for {url}")
-                    traceback.format_exc()
-        return None
 
-    def _one_request(self, method: str, url: URL, opts: dict, retry: int):
+    def _one_request(self, method: str, url: URL, opts: dict, retry: bool):
         """
         Perform one request, possibly raising RetryException in the case
-        the response is 429. Otherwise, if error text contain "code" string,
+        the response is 429/504 or the connection failed, and the retry policy allows it.
+        Otherwise, if error text contain "code" string,
         then it decodes to json object and returns APIError.
-        Returns the body json in the 200 status.
+        Returns the body json in the 200 status, or the unread response for a stream request.
         """
-        retry_codes = self._retry_codes
         try:
-            resp = self._session.request(method, url, **opts)
+            resp = self._send(method, url, opts)
             resp.raise_for_status()
 
-            if resp.text != "":
+            if opts.get("stream"):
+                return resp
+
+            # resp.text would guess the charset of the body, decode the bytes directly
+            if resp.content:
                 try:
-                    return resp.json()
+                    return json_codec.loads(resp.content)
                 except Exception as exc:
                     logger.debug(traceback.format_exc())
                     logger.warning(
@@ -179,25 +317,20 @@ class Client:
                     )
 
         except HTTPError as http_error:
+            error = self._http_error(resp, http_error)
             # retry if we hit Rate Limit
-            if resp.status_code in retry_codes and retry > 0:
-                raise RetryException() from http_error
-            if "code" in resp.text:
-                error = resp.json()
-                if "code" in error:
-                    raise APIError(error, http_error) from http_error
-            else:
+            if retry and self._retry_policy.should_retry(method, resp.status_code):
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                raise RetryException(error, retry_after) from http_error
+            if isinstance(error, APIError):
+                raise error from http_error
+            if error is not None:
                 raise
         except requests.ConnectionError as conn:
-            # Trying to solve https://github.com/psf/requests/issues/4664
-            try:
-                return self._session.request(method, url, **opts).json()
-            except Exception as exc:
-                logger.debug(traceback.format_exc())
-                logger.warning(
-                    f"Unexpected error while retrying after a connection error - {exc}"
-                )
-                raise conn
+            # Stale keep-alive connections, https://github.com/psf/requests/issues/4664
+            if retry and self._retry_policy.should_retry(method):
+                raise RetryException(conn) from conn
+            raise
         except Exception as exc:
             logger.debug(traceback.format_exc())
             logger.warning(
@@ -206,6 +339,27 @@ class Client:
 
         return None
 
+    @staticmethod
+    def _http_error(resp: requests.Response, http_error: HTTPError) -> Optional[Exception]:
+        """
+        APIError when the body holds a server error, the http error otherwise
+        """
+        if "code" in resp.text:
+            error = json_codec.loads(resp.content)
+            if "code" in error:
+                return APIError(error, http_error)
+            return None
+        return http_error
+
+    def _send(self, method: str, url: URL, opts: dict) -> requests.Response:
+        """
+        Send through the rate controller, which learns from the response status
+        """
+        with self._rate.slot() as permit:
+            resp = self._session.request(method, url, **opts)
+            permit.observe(resp.status_code)
+            return resp
+
     def get(self, path, data=None):
         """
         GET method
@@ -219,6 +373,19 @@ class Client:
         """
         return self._request("GET", path, data)
 
+    def get_stream(self, path, data=None) -> Optional[requests.Response]:
+        """
+        GET method, the body is not read: the caller iterates resp.iter_content() and closes the response
+
+        Parameters:
+            path (str):
+            data ():
+
+        Returns:
+            Response
+        """
+        return self._request("GET", path, data, stream=True)
+
     def post(self, path, data=None):
         """
         POST method
@@ -232,18 +399,19 @@ class Client:
         """
         return self._request("POST", path, data)
 
-    def put(self, path, data=None):
+    def put(self, path, data=None, headers: dict = None):
         """
         PUT method
 
         Parameters:
             path (str):
             data ():
+            headers (dict): replace the default json Content-type
 
         Returns:
             Response
         """
-        return self._request("PUT", path, data)
+        return self._request("PUT", path, data, headers=headers)
 
     def patch(self, path, data=None):
         """
@@ -276,6 +444,22 @@ class Client:
         """
         return self._request("DELETE", path, data)
 
+    def prewarm(self, connections: int, path: str = "/system/version"):
+        """
+        Open connections to the server before a burst of requests, so that the first requests
+        of the burst do not pay for the TCP/TLS setup. The connections are kept in the pool.
+
+        Parameters:
+            connections (int): number of connections to open, at most pool_maxsize
+            path (str): cheap GET endpoint used to open the connections
+        """
+        connections = min(connections, self.config.pool_maxsize)
+        if connections <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="prewarm") as executor:
+            list(executor.map(lambda _: self.get(path), range(connections)))
+        logger.debug(f"Pre-warmed {connections} connection(s)")
+
     def __enter__(self):
         return self
 
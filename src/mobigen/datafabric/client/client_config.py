@@ -12,7 +12,12 @@ class ClientConfig(ConfigModel):
     base_url: str
     api_version: Optional[str] = "v1"
     retry: Optional[int] = 3
+    # Longest single wait between two retries, seconds
     retry_wait: Optional[int] = 30
+    # First backoff ceiling, doubled on every retry (full jitter)
+    retry_base_wait: float = 1.0
+    # Total seconds a request may spend waiting for retries, None for no budget
+    retry_max_elapsed: Optional[float] = 120.0
     retry_codes: List[int] = [429, 504]
     auth_token: Optional[Callable] = None
     access_token: Optional[str] = None
@@ -20,3 +25,16 @@ class ClientConfig(ConfigModel):
     auth_header: Optional[str] = None
     extra_headers: Optional[dict] = None
     auth_token_mode: Optional[str] = "Bearer"
+    # Number of host connection pools kept by the session
+    pool_connections: int = 10
+    # Connections kept open per host, should not be lower than the number of concurrent requests
+    pool_maxsize: int = 10
+    # Wait for a free connection instead of opening a throwaway one when the pool is exhausted
+    pool_block: bool = False
+    # Idle seconds before TCP keep-alive probes (requests) / before closing an idle connection (aiohttp)
+    keep_alive_timeout: Optional[int] = None
+    # Hard ceiling on the request rate (requests per second)
+    max_rps: Optional[float] = None
+    # Adapt the requests in flight (up to max_in_flight) and the rate to 429/504 responses
+    adaptive: bool = False
+    max_in_flight: Optional[int] = None
@@ -0,0 +1,41 @@
+"""
+JSON encoding/decoding of the request and response bodies.
+orjson is used when installed, the standard json module otherwise.
+"""
+import json
+from typing import Any, Union
+
+from pydantic.v1 import BaseModel
+from pydantic.v1.json import pydantic_encoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+FAST_JSON = orjson is not None
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize obj to utf-8 bytes, without escaping non ascii characters (a hangul syllable is 3 bytes instead of 6).
+    Values unknown to the encoder (UUID, datetime, pydantic models, ...) go through pydantic_encoder
+    """
+    if FAST_JSON:
+        return orjson.dumps(obj, default=pydantic_encoder)
+    return json.dumps(obj, default=pydantic_encoder, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    if FAST_JSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_model(model: BaseModel) -> bytes:
+    """
+    Request body of a pydantic model. Unset (None) fields are dropped, the server reads a missing field as null.
+    Fields equal to their default are kept, the defaults of the generated models and of the server
+    may diverge over versions.
+    """
+    return dumps(model.dict(exclude_none=True))
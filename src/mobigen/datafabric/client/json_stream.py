@@ -0,0 +1,110 @@
+"""
+Incremental decoding of a JSON object holding a large array, e.g. the {"data": [...], "paging": {...}}
+body of the list endpoints. The array elements are decoded one at a time from the body chunks,
+so the memory is proportional to one element instead of the whole body.
+"""
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator
+
+# Bytes read from the response stream at a time
+STREAM_CHUNK_BYTES = 64 * 1024
+# Consumed text dropped from the buffer once it grows over this size
+COMPACT_CHARS = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonArrayStream:
+    """
+    Iterate the elements of the array under array_key of a top-level JSON object.
+    The other members of the object are decoded whole into fields, the members following the array
+    (such as "paging") are available once the iteration is over.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], array_key: str = "data"):
+        self.array_key = array_key
+        self.fields: Dict[str, Any] = {}
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[Any]:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == self.array_key:
+                yield from self._array()
+            else:
+                self.fields[key] = self._value()
+            if self._expect(",}") == "}":
+                return
+
+    def _array(self) -> Iterator[Any]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(",]") == "]":
+                return
+
+    def _read(self) -> bool:
+        """
+        Append the next chunk to the buffer, False at the end of the stream
+        """
+        if self._eof:
+            return False
+        if self._pos > COMPACT_CHARS:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            self._buffer += self._text.decode(b"", final=True)
+        else:
+            self._buffer += self._text.decode(chunk)
+        return True
+
+    def _peek(self) -> str:
+        """
+        Next non-whitespace character, not consumed
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                raise json.JSONDecodeError("Unexpected end of stream", self._buffer, self._pos)
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if char not in chars:
+            raise json.JSONDecodeError(f"Expecting one of {chars!r}", self._buffer, self._pos)
+        self._pos += 1
+        return char
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # incomplete value, or invalid at the end of the stream
+                if not self._read():
+                    raise
+                continue
+            # a value ending the buffer may go on in the next chunk (a number), a delimiter must follow
+            if end < len(self._buffer) or self._eof:
+                self._pos = end
+                return value
+            self._read()
@@ -10,7 +10,7 @@
 #  limitations under the License.
 """Pydantic models for ometa client API"""
 
-from typing import Generic, List, Optional, TypeVar
+from typing import Generic, List, NamedTuple, Optional, TypeVar
 
 from pydantic.v1 import BaseModel
 
@@ -30,3 +30,22 @@ class EntityList(Generic[T], BaseModel):
     entities: List[T]
     total: int
     after: Optional[str] = None
+
+
+class WriteResult(NamedTuple):
+    """
+    Lean result of a PUT/POST: the fields picked from the response without building the entity
+
+    Attributes
+        id (str): entity id
+        version (float): entity version after the write
+        fullyQualifiedName (str): entity fqn
+    """
+
+    id: Optional[str]
+    version: Optional[float]
+    fullyQualifiedName: Optional[str]
+
+    @classmethod
+    def from_response(cls, resp: dict) -> "WriteResult":
+        return cls(resp.get("id"), resp.get("version"), resp.get("fullyQualifiedName"))
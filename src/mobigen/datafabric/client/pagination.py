@@ -0,0 +1,102 @@
+import queue
+import threading
+from typing import Any, Callable, Generic, Iterable, Iterator, NamedTuple, Optional, TypeVar
+
+import requests
+
+from mobigen.datafabric.client.json_stream import STREAM_CHUNK_BYTES, JsonArrayStream
+from mobigen.datafabric.client.models import EntityList
+
+T = TypeVar("T")
+
+DEFAULT_PREFETCH = 1
+
+
+class _PageError(NamedTuple):
+    error: BaseException
+
+
+_LAST_PAGE = object()
+
+
+def iterate_pages(fetch: Callable[[Optional[str]], EntityList],
+                  prefetch: int = DEFAULT_PREFETCH) -> Iterator[EntityList]:
+    """
+    Follow the after cursors from the first page to the last one.
+
+    With prefetch > 0 the pages are fetched by a background thread, the request of the next page is sent
+    as soon as the cursor of the current page is known, while the current page is being consumed.
+    At most prefetch pages are buffered ahead of the consumer.
+
+    :param fetch: fetch the page following the cursor, the first page for None
+    :param prefetch: number of pages fetched ahead, 0 to fetch a page only when the previous one is consumed
+    """
+    if prefetch <= 0:
+        after = None
+        while True:
+            page = fetch(after)
+            yield page
+            after = page.after
+            if not after:
+                return
+
+    pages = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def worker():
+        after = None
+        try:
+            while not stop.is_set():
+                page = fetch(after)
+                pages.put(page)
+                after = page.after
+                if not after:
+                    pages.put(_LAST_PAGE)
+                    return
+        except BaseException as e:
+            pages.put(_PageError(e))
+
+    thread = threading.Thread(target=worker, name="page-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            page = pages.get()
+            if page is _LAST_PAGE:
+                return
+            if isinstance(page, _PageError):
+                raise page.error
+            yield page
+    finally:
+        # Consumer done or gone: stop the worker after its current request, unblock it if the queue is full
+        stop.set()
+        while thread.is_alive():
+            try:
+                pages.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+class EntityStream(Generic[T]):
+    """
+    Entities of one list page decoded from the response stream, see APIS.stream_entities.
+    total and after are read from the paging following the entities, they are set once the stream is consumed.
+    The response is closed at the end of the iteration, or when the iteration is abandoned.
+    """
+
+    def __init__(self,
+                 response: requests.Response,
+                 decode: Callable[[Iterable[Any]], Iterable[T]],
+                 chunk_size: int = STREAM_CHUNK_BYTES):
+        self.total: Optional[int] = None
+        self.after: Optional[str] = None
+        self._response = response
+        self._decode = decode
+        self._chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[T]:
+        with self._response:
+            body = JsonArrayStream(self._response.iter_content(chunk_size=self._chunk_size), array_key="data")
+            yield from self._decode(body)
+        paging = body.fields.get("paging") or {}
+        self.total = paging.get("total")
+        self.after = paging.get("after")
@@ -0,0 +1,171 @@
+import asyncio
+import contextlib
+import threading
+import time
+from typing import AsyncIterator, Iterator, List, Optional
+
+from mobigen.datafabric.utils.logger import rest_logger
+
+logger = rest_logger()
+
+# Overload signals within the cooldown of a decrease come from the same burst and are ignored
+DECREASE_COOLDOWN_SECONDS = 1.0
+DECREASE_FACTOR = 0.5
+MIN_RPS = 1.0
+
+
+class RatePermit:
+    """
+    One request admitted by the RateController, the caller reports the response status
+    """
+
+    def __init__(self, overload_codes: List[int]):
+        self._overload_codes = overload_codes
+        self.overloaded: Optional[bool] = None
+
+    def observe(self, status_code: int):
+        self.overloaded = status_code in self._overload_codes
+
+
+class RateController:
+    """
+    Client side admission control shared by every request of a client.
+
+    - max_rps: hard ceiling on the request rate, requests are paced 1 / rate seconds apart
+    - adaptive: AIMD on the number of requests in flight (up to max_in_flight) and on the rate.
+      Each overload response (429/504) halves both, at most once per cooldown,
+      and each other response adds 1 / value, i.e. about +1 per round of requests.
+
+    Without max_rps and adaptive, requests go through untouched.
+    Requests waiting for an in-flight slot sleep on a condition notified when a slot is released.
+    A controller serves either threads (slot) or the tasks of one event loop (async_slot).
+    """
+
+    def __init__(self,
+                 max_rps: Optional[float] = None,
+                 adaptive: bool = False,
+                 max_in_flight: Optional[int] = None,
+                 overload_codes: Optional[List[int]] = None):
+        self.max_rps = max_rps
+        self.adaptive = adaptive
+        self.max_in_flight = max_in_flight if adaptive and max_in_flight else None
+        self.overload_codes = overload_codes or [429, 504]
+        self.enabled = bool(max_rps) or self.max_in_flight is not None
+
+        self.rate: Optional[float] = max_rps
+        self.limit: Optional[float] = float(self.max_in_flight) if self.max_in_flight else None
+        self.in_flight = 0
+        self._next_at = 0.0
+        self._decreased_at = 0.0
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        # asyncio conditions are bound to one event loop, the client may outlive it (one asyncio.run per sheet)
+        self._async_slot_freed: Optional[asyncio.Condition] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _try_acquire(self) -> Optional[float]:
+        """
+        Take an in-flight slot and the next send time, the lock must be held
+        :return: None when every slot is taken, otherwise the seconds to wait before sending
+        """
+        if self.limit is not None and self.in_flight >= int(self.limit):
+            return None
+        self.in_flight += 1
+        if not self.rate:
+            return 0.0
+        now = time.monotonic()
+        send_at = max(now, self._next_at)
+        self._next_at = send_at + 1.0 / self.rate
+        return send_at - now
+
+    def _release(self, overloaded: Optional[bool]) -> int:
+        """
+        :param overloaded: None when no response was received (connection error)
+        :return: number of waiters that can take a slot now
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if self.adaptive and overloaded is not None:
+                if overloaded:
+                    self._decrease()
+                else:
+                    self._increase()
+            free = 1 if self.limit is None else max(0, int(self.limit) - self.in_flight)
+            if free:
+                self._slot_freed.notify(free)
+            return free
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self._decreased_at < DECREASE_COOLDOWN_SECONDS:
+            return
+        self._decreased_at = now
+        if self.limit is not None:
+            self.limit = max(1.0, self.limit * DECREASE_FACTOR)
+        if self.rate:
+            self.rate = max(MIN_RPS, self.rate * DECREASE_FACTOR)
+        logger.warning(f"Server Overloaded, Slow Down. In Flight: {self._limit_str()}, Rate: {self._rate_str()}")
+
+    def _increase(self):
+        if self.limit is not None and self.limit < self.max_in_flight:
+            self.limit = min(float(self.max_in_flight), self.limit + 1.0 / self.limit)
+        if self.rate and self.rate < self.max_rps:
+            self.rate = min(self.max_rps, self.rate + 1.0 / self.rate)
+
+    def _limit_str(self) -> str:
+        return str(int(self.limit)) if self.limit is not None else "unlimited"
+
+    def _rate_str(self) -> str:
+        return f"{self.rate:.1f}/s" if self.rate else "unlimited"
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[RatePermit]:
+        permit = RatePermit(self.overload_codes)
+        if not self.enabled:
+            yield permit
+            return
+        with self._slot_freed:
+            delay = self._try_acquire()
+            while delay is None:
+                self._slot_freed.wait()
+                delay = self._try_acquire()
+        try:
+            if delay > 0:
+                time.sleep(delay)
+            yield permit
+        finally:
+            self._release(permit.overloaded)
+
+    def _async_condition(self) -> asyncio.Condition:
+        """
+        Condition of the running event loop, created again when the loop changed
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_slot_freed = asyncio.Condition()
+            self._async_loop = loop
+        return self._async_slot_freed
+
+    @contextlib.asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[RatePermit]:
+        permit = RatePermit(self.overload_codes)
+        if not self.enabled:
+            yield permit
+            return
+        slot_freed = self._async_condition()
+        async with slot_freed:
+            while True:
+                with self._lock:
+                    delay = self._try_acquire()
+                if delay is not None:
+                    break
+                await slot_freed.wait()
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield permit
+        finally:
+            free = self._release(permit.overloaded)
+            if free:
+                async with slot_freed:
+                    slot_freed.notify(free)
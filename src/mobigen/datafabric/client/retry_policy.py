@@ -0,0 +1,85 @@
+import email.utils
+import random
+import time
+from typing import List, Optional
+
+from mobigen.datafabric.utils.logger import rest_logger
+
+logger = rest_logger()
+
+# Methods that can be replayed without side effects if the first attempt did reach the server
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# The server rejected the request without processing it, any method can be replayed
+REJECTED_CODES = {429, 503}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header, given as seconds or as an HTTP date
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a request.
+
+    - exponential backoff with full jitter: the n-th wait is random in [0, min(max_wait, base_wait * 2^n)]
+    - Retry-After sent by the server replaces the computed wait and is honored in full, retrying earlier would
+      only hit the server's back-off window again. When it goes past max_elapsed, the request is given up
+    - max_elapsed bounds the total time spent waiting on one request
+    - 504 and connection errors are only retried for idempotent methods,
+      a POST may have been processed before the connection dropped
+    """
+
+    def __init__(self,
+                 retries: int = 3,
+                 base_wait: float = 1.0,
+                 max_wait: float = 30.0,
+                 max_elapsed: Optional[float] = 120.0,
+                 retry_codes: Optional[List[int]] = None):
+        self.retries = max(0, retries or 0)
+        self.base_wait = base_wait
+        self.max_wait = max_wait
+        self.max_elapsed = max_elapsed
+        self.retry_codes = retry_codes if retry_codes is not None else [429, 504]
+
+    def should_retry(self, method: str, status_code: Optional[int] = None) -> bool:
+        """
+        :param status_code: None for a connection error
+        """
+        if status_code is not None and status_code not in self.retry_codes:
+            return False
+        if status_code in REJECTED_CODES:
+            return True
+        return method.upper() in IDEMPOTENT_METHODS
+
+    def next_wait(self, attempt: int, elapsed: float, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        :param attempt: number of retries already done
+        :param elapsed: seconds since the first attempt
+        :return: seconds to wait before the next attempt, None when the request should not be retried
+        """
+        if attempt >= self.retries:
+            return None
+        if retry_after is not None:
+            if self.max_elapsed is not None and elapsed + retry_after > self.max_elapsed:
+                logger.warning(f"Retry-After Exceeds The Retry Budget, Give Up. Retry-After: {retry_after:.1f}s, "
+                               f"Elapsed: {elapsed:.1f}s, Budget: {self.max_elapsed:.1f}s")
+                return None
+            return retry_after
+        wait = random.uniform(0, min(self.max_wait, self.base_wait * (2 ** attempt)))
+        if self.max_elapsed is not None and elapsed + wait > self.max_elapsed:
+            return None
+        return wait
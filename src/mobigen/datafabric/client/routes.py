@@ -1,3 +1,7 @@
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Type
+
+from pydantic.v1 import BaseModel
 
 from generated.schema.entity.data.glossary import Glossary
 from generated.schema.entity.data.glossaryTerm import GlossaryTerm
@@ -6,10 +10,63 @@ from generated.schema.api.data.createGlossaryTerm import (
     CreateGlossaryTermRequest,
 )
 
-ROUTES = {
-    # Glossaries
-    Glossary.__name__: "/glossaries",
-    CreateGlossaryRequest.__name__: "/glossaries",
-    GlossaryTerm.__name__: "/glossaryTerms",
-    CreateGlossaryTermRequest.__name__: "/glossaryTerms",
-}
+
+class EntityRegistry:
+    """
+    Endpoint of each entity and create request type, and the entity type created by each create request.
+    Built once at import, the lookups are dict lookups by class.
+    New entity types are added with register, e.g.
+        REGISTRY.register(Tag, "/tags", CreateTagRequest)
+    """
+
+    def __init__(self):
+        self._routes: Dict[Type[BaseModel], str] = {}
+        self._routes_by_name: Dict[str, str] = {}
+        self._entity_by_create: Dict[Type[BaseModel], Type[BaseModel]] = {}
+        self._create_by_entity: Dict[Type[BaseModel], Type[BaseModel]] = {}
+
+    def register(self,
+                 entity: Type[BaseModel],
+                 route: str,
+                 create: Optional[Type[BaseModel]] = None):
+        self._add_route(entity, route)
+        if create is not None:
+            self._add_route(create, route)
+            self.register_create(create, entity)
+
+    def register_create(self, create: Type[BaseModel], entity: Type[BaseModel]):
+        self._entity_by_create[create] = entity
+        self._create_by_entity[entity] = create
+
+    def _add_route(self, cls: Type[BaseModel], route: str):
+        self._routes[cls] = route
+        self._routes_by_name[cls.__name__] = route
+
+    def route(self, cls: Type[BaseModel]) -> Optional[str]:
+        route = self._routes.get(cls)
+        if route is None:
+            # same class imported from another module path
+            route = self._routes_by_name.get(cls.__name__)
+        return route
+
+    def entity_of(self, create: Type[BaseModel]) -> Optional[Type[BaseModel]]:
+        return self._entity_by_create.get(create)
+
+    def create_of(self, entity: Type[BaseModel]) -> Optional[Type[BaseModel]]:
+        return self._create_by_entity.get(entity)
+
+    def routes(self) -> Mapping[str, str]:
+        """
+        Read-only live view of the route of each class name, entities registered later are included
+        """
+        return MappingProxyType(self._routes_by_name)
+
+
+REGISTRY = EntityRegistry()
+
+# Glossaries
+REGISTRY.register(Glossary, "/glossaries", CreateGlossaryRequest)
+REGISTRY.register(GlossaryTerm, "/glossaryTerms", CreateGlossaryTermRequest)
+
+# Route of each class name, live view of the registry
+ROUTES = REGISTRY.routes()
@@ -31,3 +31,24 @@ class ServerConnection(BaseModel):
         False, description='Force the overwriting of any entity.'
     )
     extraHeaders: Optional[ExtraHeaders] = Field(None, title='Extra Headers')
+    poolConnections: Optional[int] = Field(
+        10, description='Number of host connection pools kept by the client.'
+    )
+    poolMaxSize: Optional[int] = Field(
+        10, description='Maximum number of connections kept open per host.'
+    )
+    poolBlock: Optional[bool] = Field(
+        False, description='Wait for a free pooled connection instead of opening a new one.'
+    )
+    keepAliveTimeout: Optional[int] = Field(
+        None, description='Idle seconds before TCP keep-alive probes are sent on pooled connections.'
+    )
+    maxRps: Optional[float] = Field(
+        None, description='Maximum number of requests per second sent to the server.'
+    )
+    adaptiveRate: Optional[bool] = Field(
+        False, description='Lower the requests in flight and the request rate when the server is overloaded.'
+    )
+    maxInFlight: Optional[int] = Field(
+        None, description='Maximum number of requests in flight with adaptiveRate.'
+    )
@@ -0,0 +1,47 @@
+import hashlib
+import json
+from typing import Iterable, Optional
+
+from generated.schema.api.data.createGlossaryTerm import CreateGlossaryTermRequest
+from generated.schema.entity.data.glossaryTerm import GlossaryTerm
+from mobigen.datafabric.utils.utils import model_str
+
+
+def term_fingerprint(name,
+                     display_name,
+                     description,
+                     synonyms: Optional[Iterable] = None,
+                     related_terms: Optional[Iterable[str]] = None) -> str:
+    """
+    Hash of the term content uploaded from the sheets.
+    Lists are compared as sets and missing values as empty, so the same term gives the same hash
+    whether it comes from a create request or from the server.
+    """
+    content = [
+        model_str(name),
+        model_str(display_name) if display_name else "",
+        model_str(description) if description else "",
+        sorted(model_str(synonym) for synonym in synonyms or ()),
+        sorted(related_terms or ()),
+    ]
+    return hashlib.sha1(json.dumps(content, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def request_fingerprint(term: CreateGlossaryTermRequest) -> str:
+    return term_fingerprint(
+        term.name,
+        term.displayName,
+        term.description,
+        term.synonyms,
+        [model_str(related) for related in term.relatedTerms or ()],
+    )
+
+
+def entity_fingerprint(term: GlossaryTerm) -> str:
+    return term_fingerprint(
+        term.name,
+        term.displayName,
+        term.description,
+        term.synonyms,
+        [model_str(related.fullyQualifiedName) for related in term.relatedTerms or ()],
+    )
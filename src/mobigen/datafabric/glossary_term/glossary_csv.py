@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import csv
+import io
+from typing import TYPE_CHECKING, Iterable, Iterator, List, NamedTuple, Tuple
+
+from mobigen.datafabric.utils.utils import model_str
+
+if TYPE_CHECKING:
+    from generated.schema.api.data.createGlossaryTerm import CreateGlossaryTermRequest
+
+# Column layout of the server glossary CSV import/export
+GLOSSARY_CSV_HEADER = [
+    "parent", "name*", "displayName", "description", "synonyms",
+    "relatedTerms", "references", "tags", "reviewers", "owner", "status",
+]
+# Separator of the values of a multi-valued column
+MULTI_VALUE_SEPARATOR = ";"
+# Columns added in front of the import results
+RESULT_STATUS_COLUMN = 0
+RESULT_DETAILS_COLUMN = 1
+RESULT_SUCCESS = "success"
+
+
+class CsvChunk(NamedTuple):
+    """
+    Terms serialized in one import request, terms[i] is the i-th row after the header
+    """
+    terms: List[Tuple[int, CreateGlossaryTermRequest]]
+    text: str
+
+
+class RowResult(NamedTuple):
+    success: bool
+    details: str
+
+
+def join_values(values) -> str:
+    # the separator can not be escaped inside a value
+    return MULTI_VALUE_SEPARATOR.join(
+        model_str(value).replace(MULTI_VALUE_SEPARATOR, ",") for value in values or ()
+    )
+
+
+def term_to_row(term: CreateGlossaryTermRequest) -> List[str]:
+    """
+    Top level term of the glossary, the columns not filled by the sheets are left empty
+    """
+    return [
+        "",
+        model_str(term.name),
+        model_str(term.displayName) if term.displayName else "",
+        model_str(term.description) if term.description else "",
+        join_values(term.synonyms),
+        join_values(term.relatedTerms),
+        "", "", "", "", "",
+    ]
+
+
+def to_csv(rows: Iterable[List[str]]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(GLOSSARY_CSV_HEADER)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def csv_chunks(terms: Iterable[Tuple[int, CreateGlossaryTermRequest]],
+               max_rows: int,
+               max_bytes: int) -> Iterator[CsvChunk]:
+    """
+    Split the terms into import CSV documents of at most max_rows rows and about max_bytes bytes
+    """
+    chunk: List[Tuple[int, CreateGlossaryTermRequest]] = []
+    rows: List[List[str]] = []
+    size = 0
+    for index, term in terms:
+        row = term_to_row(term)
+        row_size = sum(len(value.encode("utf-8")) for value in row) + len(row)
+        if chunk and (len(chunk) >= max_rows or size + row_size > max_bytes):
+            yield CsvChunk(chunk, to_csv(rows))
+            chunk, rows, size = [], [], 0
+        chunk.append((index, term))
+        rows.append(row)
+        size += row_size
+    if chunk:
+        yield CsvChunk(chunk, to_csv(rows))
+
+
+def parse_import_results(results_csv: str) -> List[RowResult]:
+    """
+    Per-row results of an import, in the order of the imported rows
+    """
+    if not results_csv:
+        return []
+    reader = csv.reader(io.StringIO(results_csv))
+    next(reader, None)  # header
+    return [
+        RowResult(
+            success=row[RESULT_STATUS_COLUMN].strip().lower() == RESULT_SUCCESS,
+            details=row[RESULT_DETAILS_COLUMN] if len(row) > RESULT_DETAILS_COLUMN else "",
+        )
+        for row in reader
+        if row
+    ]
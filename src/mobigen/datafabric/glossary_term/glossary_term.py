@@ -1,8 +1,22 @@
+import itertools
 from enum import Enum
-from typing import List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 from generated.schema.api.data.createGlossaryTerm import CreateGlossaryTermRequest
 from mobigen.datafabric.models import common
+from mobigen.datafabric.utils.logger import cli_logger
+
+logger = cli_logger()
+
+# Value used in the public data standard for an empty cell
+EMPTY_VALUE = "-"
+# Constraints of the entityName json schema type
+ENTITY_NAME_MAX_LENGTH = 256
+ENTITY_NAME_FORBIDDEN = "::"
+# Rows checked at once by GlossaryTermMapper.prevalidate
+VALIDATION_BATCH_ROWS = 1000
+# Fields holding entity names, checked in trusted mode
+NAME_FIELDS = frozenset(["name", "displayName", "synonyms"])
 
 
 class CommonStandardTerminologyColumnNames(Enum):
@@ -25,62 +39,191 @@ class CommonStandardWordColumnNames(Enum):
     FORBIDDEN_WORDS = "금칙어 목록"
 
 
-class MakeGlossaryTerm:
-    term: CreateGlossaryTermRequest
+# CreateGlossaryTermRequest fields collecting values from several columns
+LIST_FIELDS = frozenset(["synonyms", "relatedTerms"])
+TEXT_FIELDS = frozenset(["description"])
 
-    def __init__(self, glossary_fqn: str, sheet_name: str, columns: List[str], row):
-        self.term = CreateGlossaryTermRequest(
-            glossary=glossary_fqn,
-            name="initialize",
-            displayName="initialize",
-            description="initialize",
-        )
-        if sheet_name == common.PublicDataStandardSheetNames.COMMON_STANDARD_TERMINOLOGY.value:
-            for column in columns:
-                if row[column] is None:
-                    continue
-                if column == CommonStandardTerminologyColumnNames.TERMINOLOGY.value:
-                    data = str(row[column]).strip(" ").strip("\n")
-                    self.term.name = data
-                    self.term.displayName = data
-                    continue
-                if column == CommonStandardTerminologyColumnNames.DESC.value:
-                    data = str(row[column]).strip(" ").strip("\n")
-                    self.term.description = data
-                    continue
-                if column == CommonStandardTerminologyColumnNames.ENGLISH_ABBREVIATION.value:
-                    data = str(row[column]).strip(" ").strip("\n")
-                    self.term.synonyms = []
-                    self.term.synonyms.append(data)
+
+def as_text(value: str) -> Optional[str]:
+    return None if value == EMPTY_VALUE else value
+
+
+def as_list(value: str) -> List[str]:
+    return [] if value == EMPTY_VALUE else [value]
+
+
+def split_list(value: str) -> List[str]:
+    """ "a, b,c" -> ["a", "b", "c"] """
+    return [item for item in (item.strip() for item in value.split(",")) if item and item != EMPTY_VALUE]
+
+
+def forbidden_words(value: str) -> Optional[str]:
+    """ "a, b" -> "금칙어: a, b" paragraph appended to the description """
+    words = split_list(value)
+    return f"금칙어: {', '.join(words)}" if words else None
+
+
+class ColumnMapping(NamedTuple):
+    """
+    Declares which CreateGlossaryTermRequest fields a sheet column fills.
+    List fields (LIST_FIELDS) are extended and text fields (TEXT_FIELDS) get a new paragraph,
+    in declaration order. Other fields are set.
+    """
+    column: str
+    fields: Tuple[str, ...]
+    transform: Callable[[str], Any] = as_text
+
+
+COMMON_STANDARD_TERMINOLOGY_MAPPING = [
+    ColumnMapping(CommonStandardTerminologyColumnNames.TERMINOLOGY.value, ("name", "displayName")),
+    ColumnMapping(CommonStandardTerminologyColumnNames.DESC.value, ("description",)),
+    ColumnMapping(CommonStandardTerminologyColumnNames.ENGLISH_ABBREVIATION.value, ("synonyms",), as_list),
+    ColumnMapping(CommonStandardTerminologyColumnNames.SYNONYM_LIST.value, ("synonyms",), split_list),
+]
+
+COMMON_STANDARD_WORD_MAPPING = [
+    ColumnMapping(CommonStandardWordColumnNames.NAME.value, ("name", "displayName")),
+    ColumnMapping(CommonStandardWordColumnNames.DESC.value, ("description",)),
+    ColumnMapping(CommonStandardWordColumnNames.FORBIDDEN_WORDS.value, ("description",), forbidden_words),
+    ColumnMapping(CommonStandardWordColumnNames.ENGLISH_ABBREVIATION.value, ("synonyms",), as_list),
+    ColumnMapping(CommonStandardWordColumnNames.ENGLISH_NAME.value, ("synonyms",), as_list),
+    # Word synonyms are not words of the standard themselves, so they can not be relatedTerms
+    # (which must reference existing glossary terms).
+    ColumnMapping(CommonStandardWordColumnNames.SYNONYM_LIST.value, ("synonyms",), split_list),
+]
+
+SHEET_MAPPINGS = {
+    common.PublicDataStandardSheetNames.COMMON_STANDARD_TERMINOLOGY.value: COMMON_STANDARD_TERMINOLOGY_MAPPING,
+    common.PublicDataStandardSheetNames.COMMON_STANDARD_WORD.value: COMMON_STANDARD_WORD_MAPPING,
+}
+
+
+def get_sheet_columns(sheet_name: str) -> Optional[List[str]]:
+    """
+    Columns read by the mapping of the sheet, plus the row number column.
+    None if the sheet is unknown, in that case every column should be read.
+    """
+    mapping = SHEET_MAPPINGS.get(sheet_name)
+    if mapping is None:
+        return None
+    return [common.PublicDataStandardCommonColumnNames.NUMBER.value] + [column.column for column in mapping]
+
+
+class InvalidTermException(Exception):
+    """
+    Raised in trusted mode when a row can not produce a valid term
+    """
+
+
+def check_term_fields(fields: Dict[str, Any]):
+    """
+    Checks done in trusted mode instead of the pydantic validation, for the rows not cleared by
+    GlossaryTermMapper.prevalidate.
+    Values produced by the mappings are already normalized strings (or lists of strings),
+    so only the constraints of the entity name are left to verify.
+    """
+    name = fields["name"]
+    if len(name) > ENTITY_NAME_MAX_LENGTH or ENTITY_NAME_FORBIDDEN in name:
+        raise InvalidTermException(f"Invalid Term Name: {name}")
+    for synonym in fields.get("synonyms", ()):
+        if len(synonym) > ENTITY_NAME_MAX_LENGTH or ENTITY_NAME_FORBIDDEN in synonym:
+            raise InvalidTermException(f"Invalid Synonym: {synonym}, Term: {name}")
+
+
+class GlossaryTermMapper:
+    """
+    Mapping of a sheet compiled against its header.
+    Turns a row of normalized values into a CreateGlossaryTermRequest in a single pass.
+
+    In trusted mode the request is built with `construct` (no pydantic validation). The name columns are
+    checked in bulk by prevalidate, the rows it can not clear go through check_term_fields.
+    """
+
+    def __init__(self, mapping: List[ColumnMapping], columns: List[str], trusted: bool = False):
+        self.trusted = trusted
+        positions = {column: pos for pos, column in enumerate(columns)}
+        self.steps: List[Tuple[int, Tuple[str, ...], Callable[[str], Any]]] = []
+        for column_mapping in mapping:
+            pos = positions.get(column_mapping.column)
+            if pos is None:
+                logger.warning(f"Column Not Found: {column_mapping.column}")
+                continue
+            self.steps.append((pos, column_mapping.fields, column_mapping.transform))
+        # Columns mapped to entity names. The transforms only drop, split or trim values,
+        # so a cell passing the checks can not produce an invalid name.
+        self.name_positions = sorted({pos for pos, names, _ in self.steps if NAME_FIELDS.intersection(names)})
+
+    @classmethod
+    def compile(cls, sheet_name: str, columns: List[str], trusted: bool = False) -> Optional["GlossaryTermMapper"]:
+        """
+        Compile the mapping of the sheet, None if the sheet is not supported
+        """
+        mapping = SHEET_MAPPINGS.get(sheet_name)
+        if mapping is None:
+            return None
+        return cls(mapping, columns, trusted=trusted)
+
+    def map_fields(self, values: tuple) -> Dict[str, Any]:
+        fields: Dict[str, Any] = {}
+        for pos, names, transform in self.steps:
+            value = values[pos]
+            if value is None:
+                continue
+            value = transform(value)
+            if value is None:
+                continue
+            for name in names:
+                if name in LIST_FIELDS:
+                    fields.setdefault(name, []).extend(value)
+                elif name in TEXT_FIELDS and name in fields:
+                    fields[name] = f"{fields[name]}\n\n{value}"
+                else:
+                    fields[name] = value
+        for name in LIST_FIELDS.intersection(fields):
+            # e.g. the english abbreviation of a word is often its english name
+            fields[name] = list(dict.fromkeys(fields[name]))
+        return fields
+
+    def prevalidate(self, rows: Iterable[Tuple[int, tuple]]) -> Iterator[Tuple[int, tuple, bool]]:
+        """
+        Trusted mode: check the name columns of the rows in bulk, VALIDATION_BATCH_ROWS rows at a time.
+        :return: (index, values, validated), validated rows need no check_term_fields in map
+        """
+        if not self.trusted:
+            for index, values in rows:
+                yield index, values, False
+            return
+        rows = iter(rows)
+        while True:
+            batch = list(itertools.islice(rows, VALIDATION_BATCH_ROWS))
+            if not batch:
+                return
+            valid = [True] * len(batch)
+            for pos in self.name_positions:
+                cells = [values[pos] or "" for _, values in batch]
+                # one pass over the whole column, rows are only looked at one by one when it fails
+                if (max(map(len, cells)) <= ENTITY_NAME_MAX_LENGTH
+                        and ENTITY_NAME_FORBIDDEN not in "\n".join(cells)):
                     continue
-                if column == CommonStandardTerminologyColumnNames.SYNONYM_LIST.value:
-                    data = str(row[column]).strip(" ").strip("\n")
-                    if data == "-":
-                        continue
-                    if self.term.synonyms is None:
-                        self.term.synonyms = []
-
-                    if "," in data:
-                        synonym_list = data.split(",")
-                        for synonym in synonym_list:
-                            synonym = synonym.strip(" ").strip("\n")
-                            self.term.synonyms.append(synonym)
-                    else:
-                        self.term.synonyms.append(data)
-
-        elif sheet_name == common.PublicDataStandardSheetNames.COMMON_STANDARD_WORD.value:
-            for column in enumerate(columns):
-                if column == CommonStandardWordColumnNames.NAME:
-                    self.term.name = row[column]
-                    self.term.displayName = row[column]
-                elif column == CommonStandardWordColumnNames.DESC:
-                    self.term.description = row[column]
-                elif column == CommonStandardWordColumnNames.ENGLISH_ABBREVIATION:
-                    self.term.synonyms.clear()
-                    self.term.synonyms.append(row[column])
-                elif column == CommonStandardWordColumnNames.SYNONYM_LIST:
-                    self.term.relatedTerms.clear()
-                    self.term.relatedTerms.append(row[column])
-
-    def get_term(self) -> CreateGlossaryTermRequest:
-        return self.term
+                for row, cell in enumerate(cells):
+                    if len(cell) > ENTITY_NAME_MAX_LENGTH or ENTITY_NAME_FORBIDDEN in cell:
+                        valid[row] = False
+            for (index, values), validated in zip(batch, valid):
+                yield index, values, validated
+
+    def map(self, glossary_fqn: str, values: tuple, validated: bool = False) -> Optional[CreateGlossaryTermRequest]:
+        """
+        :param glossary_fqn: fully qualified name of the glossary
+        :param values: normalized row values ordered like the compiled columns
+        :param validated: the row was cleared by prevalidate
+        :return: create request, None if the row has no term name
+        """
+        fields = self.map_fields(values)
+        if "name" not in fields:
+            return None
+        fields.setdefault("description", "")
+        if self.trusted:
+            if not validated:
+                check_term_fields(fields)
+            return CreateGlossaryTermRequest.construct(glossary=glossary_fqn, **fields)
+        return CreateGlossaryTermRequest(glossary=glossary_fqn, **fields)
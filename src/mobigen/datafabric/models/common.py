@@ -14,3 +14,7 @@ T = TypeVar("T")
 class PublicDataStandardSheetNames(Enum):
     COMMON_STANDARD_TERMINOLOGY = "공통표준용어"
     COMMON_STANDARD_WORD = "공통표준단어"
+
+
+class PublicDataStandardCommonColumnNames(Enum):
+    NUMBER = "번호"
@@ -1,19 +1,30 @@
 import os
 from abc import ABC, abstractmethod
 from functools import singledispatchmethod
+from typing import Iterator, List, NamedTuple, Optional, Tuple
 
 import pandas as pd
 from enum import Enum
 from pydantic.v1 import Extra, Field, BaseModel
 
+from mobigen.datafabric.models import common
+from mobigen.datafabric.reader.normalizer import normalize_frame
+from mobigen.datafabric.reader.sheet_cache import SheetCache
 from mobigen.datafabric.utils.logger import cli_logger
 
+logger = cli_logger()
+
 
 class SourceType(Enum):
     EXCEL = 'EXCEL'
     CSV = 'CSV'
 
 
+class ReadMode(Enum):
+    DATAFRAME = 'DATAFRAME'
+    STREAM = 'STREAM'
+
+
 class GlossarySourceConfig(BaseModel):
     class Config:
         extra = Extra.forbid
@@ -26,6 +37,35 @@ class GlossarySourceConfig(BaseModel):
         ...,
         description='Path to the source file.',
     )
+    read_mode: ReadMode = Field(
+        default=ReadMode.DATAFRAME,
+        description='Load the whole sheet into a DataFrame or stream it row by row.',
+    )
+    chunk_size: int = Field(
+        default=10000,
+        description='Number of rows parsed at once when reading CSV files.',
+    )
+    encoding: Optional[str] = Field(
+        default=None,
+        description='Encoding of CSV files. Detected from a sample of the file when not set.',
+    )
+    key_column: Optional[str] = Field(
+        default=common.PublicDataStandardCommonColumnNames.NUMBER.value,
+        description='Rows with an empty value in this column are skipped.',
+    )
+    cache_dir: Optional[str] = Field(
+        default=None,
+        description='Directory of the normalized sheet cache. Cache is disabled when not set.',
+    )
+
+
+class SheetRows(NamedTuple):
+    """
+    Header of the sheet and an iterator of (index, values) records.
+    values are plain tuples ordered like columns, already normalized (str or None).
+    """
+    columns: List[str]
+    rows: Iterator[Tuple[int, tuple]]
 
 
 class DataFrameReader(ABC):
@@ -46,3 +86,39 @@ class DataFrameReader(ABC):
     @abstractmethod
     def read_csv(self, **kwargs):
         pass
+
+    def read_rows(self, **kwargs) -> Optional[SheetRows]:
+        """
+        Return the header and a row iterator of the source.
+        Default implementation loads the normalized DataFrame first (from the sheet cache if possible),
+        readers supporting ReadMode.STREAM override it to yield rows without materializing the sheet.
+        """
+        df = self.read_normalized(**kwargs)
+        if df is None:
+            return None
+        return SheetRows(
+            columns=list(df.columns),
+            rows=((row[0], row[1:]) for row in df.itertuples(index=True, name=None)),
+        )
+
+    def read_normalized(self, **kwargs) -> Optional[pd.DataFrame]:
+        cache = SheetCache(self.source.cache_dir) if self.source.cache_dir else None
+        cache_path = None
+        if cache is not None:
+            cache_path = cache.get_path(self.source.file_path, kwargs.get("sheet_name"), kwargs.get("columns"))
+            df = cache.load(cache_path)
+            if df is not None:
+                logger.debug(f"Read From Sheet Cache: {cache_path}")
+                return df
+
+        if self.source.source_type == SourceType.CSV:
+            df = self.read_csv(**kwargs)
+        else:
+            df = self.read_excel(**kwargs)
+        if df is None:
+            return None
+        df = normalize_frame(df, key_column=self.source.key_column)
+
+        if cache is not None:
+            cache.save(cache_path, df)
+        return df
@@ -0,0 +1,100 @@
+import codecs
+from typing import Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+from pandas.io.parsers import TextFileReader
+
+from mobigen.datafabric.reader.base import DataFrameReader, GlossarySourceConfig, SheetRows
+from mobigen.datafabric.reader.normalizer import column_selector, normalize_frame
+from mobigen.datafabric.utils.logger import cli_logger
+
+logger = cli_logger()
+
+# utf-8-sig also decodes plain utf-8 and strips the BOM written by Excel.
+# cp949 is a superset of euc-kr, so it covers both korean encodings.
+CANDIDATE_ENCODINGS = ["utf-8-sig", "cp949"]
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+
+def detect_encoding(file_path: str, sample_size: int = ENCODING_SAMPLE_SIZE) -> str:
+    """
+    Detect the encoding of a text file from its first bytes.
+    The sample may end in the middle of a multibyte character, so it is decoded incrementally.
+    :param file_path: path to the file
+    :param sample_size: number of bytes to inspect
+    :return: encoding name
+    """
+    with open(file_path, "rb") as file_:
+        sample = file_.read(sample_size)
+
+    for encoding in CANDIDATE_ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            decoder.decode(sample, final=False)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+
+    raise ValueError(f"Unsupported encoding. Tried: {CANDIDATE_ENCODINGS}, Path: {file_path}")
+
+
+class CsvDataFrameReader(DataFrameReader):
+    def __init__(self, source: GlossarySourceConfig):
+        self.source = source
+        super().__init__(source)
+        self.encoding = self.source.encoding
+
+    def get_encoding(self) -> str:
+        if self.encoding is None:
+            self.encoding = detect_encoding(self.source.file_path)
+            logger.debug(f"Detected Encoding: {self.encoding}, Path: {self.source.file_path}")
+        return self.encoding
+
+    def read_excel(self, **kwargs):
+        pass
+
+    def read_csv(self,
+                 chunk_size: Optional[int] = None,
+                 columns: Optional[List[str]] = None) -> Union[pd.DataFrame, TextFileReader]:
+        """
+        Read the csv file. Every value is read as text.
+        :param chunk_size: if set, return an iterator of DataFrames of chunk_size rows
+        :param columns: normalized names of the columns to parse, None for all columns
+        """
+        return pd.read_csv(
+            self.source.file_path,
+            encoding=self.get_encoding(),
+            dtype=str,
+            chunksize=chunk_size,
+            usecols=column_selector(columns),
+        )
+
+    def read_rows(self, sheet_name: str = None, columns: Optional[List[str]] = None) -> Optional[SheetRows]:
+        """
+        Return the csv rows chunk by chunk, memory is bounded by source.chunk_size.
+        Each chunk is normalized at once before its rows are yielded.
+        sheet_name is accepted for compatibility with excel sources and ignored.
+        """
+        try:
+            chunks = self.read_csv(chunk_size=self.source.chunk_size, columns=columns)
+        except pd.errors.EmptyDataError:
+            logger.warning(f"Empty File: {self.source.file_path}")
+            return SheetRows(columns=[], rows=iter(()))
+        first = next(chunks, None)
+        if first is None:
+            chunks.close()
+            return SheetRows(columns=[], rows=iter(()))
+        first = normalize_frame(first, key_column=self.source.key_column)
+        return SheetRows(columns=list(first.columns), rows=self._iter_values(first, chunks))
+
+    def _iter_values(self, first: pd.DataFrame, chunks: TextFileReader) -> Iterator[Tuple[int, tuple]]:
+        try:
+            chunk = first
+            while chunk is not None:
+                for row in chunk.itertuples(index=True, name=None):
+                    yield row[0], row[1:]
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    chunk = normalize_frame(chunk, key_column=self.source.key_column)
+        finally:
+            chunks.close()
@@ -1,6 +1,10 @@
+from typing import Iterator, List, Optional, Tuple
+
+import openpyxl
 import pandas as pd
 
-from mobigen.datafabric.reader.base import DataFrameReader, GlossarySourceConfig, SourceType
+from mobigen.datafabric.reader.base import DataFrameReader, GlossarySourceConfig, SourceType, ReadMode, SheetRows
+from mobigen.datafabric.reader.normalizer import column_selector, normalize_column_name, normalize_rows
 from mobigen.datafabric.utils.logger import cli_logger
 
 logger = cli_logger()
@@ -14,8 +18,55 @@ class ExcelDataFrameReader(DataFrameReader):
     def read_csv(self, **kwargs):
         pass
 
-    def read_excel(self, sheet_name: str) -> pd.DataFrame:
-        return pd.read_excel(self.source.file_path, sheet_name=sheet_name)
+    def read_excel(self, sheet_name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        :param sheet_name: sheet to read
+        :param columns: normalized names of the columns to parse, None for all columns
+        """
+        return pd.read_excel(self.source.file_path, sheet_name=sheet_name, usecols=column_selector(columns))
+
+    def read_rows(self, sheet_name: str, columns: Optional[List[str]] = None) -> Optional[SheetRows]:
+        if self.source.read_mode != ReadMode.STREAM:
+            return super().read_rows(sheet_name=sheet_name, columns=columns)
+        return self.stream_excel(sheet_name=sheet_name, columns=columns)
+
+    def stream_excel(self, sheet_name: str, columns: Optional[List[str]] = None) -> Optional[SheetRows]:
+        """
+        Open the workbook in read-only mode and return the sheet rows lazily.
+        Only the header row is read here, the data rows are parsed while iterating.
+        Cells right of the last selected column are not parsed.
+        """
+        workbook = openpyxl.load_workbook(self.source.file_path, read_only=True, data_only=True)
+        if sheet_name not in workbook.sheetnames:
+            logger.error(f"Sheet Not Found: {sheet_name}, Sheets: {workbook.sheetnames}")
+            workbook.close()
+            return None
+
+        worksheet = workbook[sheet_name]
+        header = next(worksheet.iter_rows(max_row=1, values_only=True), None)
+        if header is None:
+            workbook.close()
+            return SheetRows(columns=[], rows=iter(()))
+
+        # Excel sheets often carry trailing formatted cells without a header, skip them.
+        selector = column_selector(columns)
+        positions = [pos for pos, name in enumerate(header)
+                     if name is not None and (selector is None or selector(name))]
+        columns = [normalize_column_name(header[pos]) for pos in positions]
+        rows = worksheet.iter_rows(min_row=2, max_col=positions[-1] + 1 if positions else 1, values_only=True)
+        return SheetRows(
+            columns=columns,
+            rows=normalize_rows(columns, self._iter_values(workbook, rows, positions), self.source.key_column),
+        )
+
+    @staticmethod
+    def _iter_values(workbook, rows: Iterator[tuple], positions: List[int]) -> Iterator[Tuple[int, tuple]]:
+        try:
+            for index, values in enumerate(rows):
+                width = len(values)
+                yield index, tuple(values[pos] if pos < width else None for pos in positions)
+        finally:
+            workbook.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,88 @@
+import math
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+# Floats above this are not exactly integral in float64, they are kept as written by str()
+MAX_EXACT_INTEGER = 2 ** 53
+
+
+def normalize_column_name(name) -> str:
+    """
+    Collapse whitespace and newlines inside a header.
+    e.g. "금칙어 \\n목록" -> "금칙어 목록"
+    """
+    return " ".join(str(name).split())
+
+
+def column_selector(columns: Optional[Iterable[str]]) -> Optional[Callable[[str], bool]]:
+    """
+    Build a `usecols` callable matching raw headers against normalized column names.
+    None means every column is read.
+    """
+    if columns is None:
+        return None
+    wanted = frozenset(columns)
+    return lambda name: normalize_column_name(name) in wanted
+
+
+def normalize_value(value) -> Optional[str]:
+    """
+    Normalize a single cell: trim whitespace/newlines, NaN or blank -> None, anything else -> str.
+    Integral floats are written without the fraction, 1.0 -> "1"
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if value.is_integer() and abs(value) < MAX_EXACT_INTEGER:
+            return str(int(value))
+    text = str(value).strip()
+    return text if text else None
+
+
+def _as_text(values: pd.Series) -> pd.Series:
+    """
+    Same conversion to str as normalize_value, a float column with empty cells holds 1.0 for 1
+    """
+    text = values.astype("string")
+    if pd.api.types.is_float_dtype(values):
+        integral = values.notna() & (values % 1 == 0) & (values.abs() < MAX_EXACT_INTEGER)
+        text[integral] = values[integral].astype("int64").astype("string")
+    return text
+
+
+def normalize_frame(df: pd.DataFrame, key_column: Optional[str] = None) -> pd.DataFrame:
+    """
+    Columnar version of normalize_value applied to the whole DataFrame at once.
+    Rows whose key_column is empty are dropped.
+    :param df: DataFrame read from the source
+    :param key_column: column used to detect empty rows
+    :return: DataFrame of str or None values
+    """
+    df = df.rename(columns=normalize_column_name)
+    columns = {}
+    for column in df.columns:
+        text = _as_text(df[column]).str.strip()
+        text = text.mask(text == "")
+        columns[column] = text.astype(object).where(text.notna(), None)
+    frame = pd.DataFrame(columns, index=df.index)
+
+    if key_column is not None and key_column in frame.columns:
+        frame = frame[frame[key_column].notna()]
+    return frame
+
+
+def normalize_rows(columns: List[str],
+                   rows: Iterator[Tuple[int, tuple]],
+                   key_column: Optional[str] = None) -> Iterator[Tuple[int, tuple]]:
+    """
+    Row by row version of normalize_frame for streaming readers.
+    """
+    key_pos = columns.index(key_column) if key_column in columns else None
+    for index, values in rows:
+        values = tuple(normalize_value(value) for value in values)
+        if key_pos is not None and values[key_pos] is None:
+            continue
+        yield index, values
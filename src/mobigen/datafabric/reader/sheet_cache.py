@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import glob
+import hashlib
+import importlib.util
+import os
+import pickle
+from typing import TYPE_CHECKING, List, Optional
+
+from mobigen.datafabric.utils.logger import cli_logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = cli_logger()
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "datafabric-glossary-uploader")
+# Bump when the normalization rules change so that older caches are not reused.
+CACHE_VERSION = "1"
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_content_hash(file_path: str) -> str:
+    """
+    sha256 of the file content, read block by block
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_:
+        for block in iter(lambda: file_.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SheetCache:
+    """
+    Stores normalized sheets next to each other in cache_dir.
+    One file per (source file, sheet), named after the content hash of the source file,
+    so a modified workbook misses the cache and its stale entry is replaced on save.
+    Parquet is used when pyarrow is installed, pickle otherwise.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.use_parquet = importlib.util.find_spec("pyarrow") is not None
+        self.extension = "parquet" if self.use_parquet else "pkl"
+
+    @staticmethod
+    def _entry_name(file_path: str, sheet_name: Optional[str], columns: Optional[List[str]]) -> str:
+        source = "|".join([CACHE_VERSION, os.path.abspath(file_path), str(sheet_name), ",".join(columns or [])])
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    def get_path(self, file_path: str, sheet_name: Optional[str], columns: Optional[List[str]] = None) -> str:
+        entry = self._entry_name(file_path, sheet_name, columns)
+        return os.path.join(self.cache_dir, f"{entry}-{file_content_hash(file_path)}.{self.extension}")
+
+    def load(self, cache_path: str) -> Optional[pd.DataFrame]:
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            if self.use_parquet:
+                import pandas as pd
+
+                return pd.read_parquet(cache_path)
+            with open(cache_path, "rb") as file_:
+                return pickle.load(file_)
+        except Exception as e:
+            logger.warning(f"Failed To Read Sheet Cache: {cache_path}, {e}")
+            return None
+
+    def save(self, cache_path: str, df: pd.DataFrame):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = os.path.basename(cache_path).split("-")[0]
+        for stale in glob.glob(os.path.join(self.cache_dir, f"{entry}-*")):
+            if stale != cache_path:
+                os.remove(stale)
+
+        tmp_path = f"{cache_path}.tmp"
+        try:
+            if self.use_parquet:
+                df.to_parquet(tmp_path)
+            else:
+                with open(tmp_path, "wb") as file_:
+                    pickle.dump(df, file_, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Failed To Write Sheet Cache: {cache_path}, {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
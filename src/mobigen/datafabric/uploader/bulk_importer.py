@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+from mobigen.datafabric.glossary_term.glossary_csv import (
+    CsvChunk,
+    RowResult,
+    csv_chunks,
+    parse_import_results,
+    term_to_row,
+    to_csv,
+)
+from mobigen.datafabric.uploader.term_uploader import TermUploader, UploadListener, UploadSummary
+from mobigen.datafabric.utils.logger import cli_logger
+
+if TYPE_CHECKING:
+    from generated.schema.api.data.createGlossaryTerm import CreateGlossaryTermRequest
+    from generated.schema.type.csvImportResult import CsvImportResult
+    from mobigen.datafabric.client.api import APIS
+
+logger = cli_logger()
+
+DEFAULT_CHUNK_ROWS = 1000
+# Keep the import requests well under the request size limits of the server and proxies
+DEFAULT_CHUNK_BYTES = 2 * 1024 * 1024
+
+
+class ImportRowError(Exception):
+    """
+    A row rejected by the server CSV import
+    """
+
+
+class BulkTermImporter(TermUploader):
+    """
+    Upload glossary terms through the server CSV import, one request per chunk of terms instead of one per term.
+    Every chunk is validated with a dry run first, only the rows passing the validation are imported.
+    """
+
+    def __init__(self,
+                 api: APIS,
+                 glossary_name: str,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                 listeners: Optional[List[UploadListener]] = None):
+        super().__init__(api, listeners=listeners)
+        self.glossary_name = glossary_name
+        self.chunk_rows = max(1, chunk_rows)
+        self.chunk_bytes = chunk_bytes
+
+    def upload(self,
+               terms: Iterable[Tuple[int, CreateGlossaryTermRequest]],
+               summary: Optional[UploadSummary] = None) -> UploadSummary:
+        summary = summary or UploadSummary()
+        for number, chunk in enumerate(csv_chunks(terms, self.chunk_rows, self.chunk_bytes), start=1):
+            first, last = chunk.terms[0][0], chunk.terms[-1][0]
+            logger.info(f"Import Glossary Terms: Chunk {number}, Rows: {first} ~ {last}, Count: {len(chunk.terms)}")
+            try:
+                passed = self._validate(chunk, summary)
+            except Exception as e:
+                logger.error(f"Failed To Validate Chunk {number}: {e}")
+                self._record_all(summary, chunk.terms, e)
+                continue
+            if not passed:
+                continue
+            try:
+                self._import(passed, summary)
+            except Exception as e:
+                logger.error(f"Failed To Import Chunk {number}: {e}")
+                self._record_all(summary, passed, e)
+        return summary
+
+    def _record_all(self,
+                    summary: UploadSummary,
+                    terms: List[Tuple[int, CreateGlossaryTermRequest]],
+                    error: Exception):
+        for index, term in terms:
+            self._record(summary, index, term, error=error)
+
+    def _validate(self,
+                  chunk: CsvChunk,
+                  summary: UploadSummary) -> List[Tuple[int, CreateGlossaryTermRequest]]:
+        """
+        Dry run of the chunk, the rejected rows are recorded as failures
+        :return: the rows passing the validation
+        """
+        result = self.api.import_glossary_csv(self.glossary_name, chunk.text, dry_run=True)
+        rows = self._row_results(result, len(chunk.terms))
+        passed = []
+        for (index, term), row in zip(chunk.terms, rows):
+            if row.success:
+                passed.append((index, term))
+            else:
+                self._record(summary, index, term, error=ImportRowError(f"Dry Run: {row.details}"))
+        logger.info(f"Dry Run: Passed: {len(passed)}, Failed: {len(chunk.terms) - len(passed)}")
+        return passed
+
+    def _import(self, terms: List[Tuple[int, CreateGlossaryTermRequest]], summary: UploadSummary):
+        text = to_csv(term_to_row(term) for _, term in terms)
+        result = self.api.import_glossary_csv(self.glossary_name, text, dry_run=False)
+        rows = self._row_results(result, len(terms))
+        for (index, term), row in zip(terms, rows):
+            if row.success:
+                self._record(summary, index, term)
+            else:
+                self._record(summary, index, term, error=ImportRowError(row.details))
+
+    @staticmethod
+    def _row_results(result: CsvImportResult, count: int) -> List[RowResult]:
+        from generated.schema.type.apiStatus import ApiStatus
+
+        if result.status == ApiStatus.aborted:
+            raise ImportRowError(f"Import Aborted: {result.abortReason}")
+        rows = parse_import_results(result.importResultsCsv)
+        if len(rows) != count:
+            raise ImportRowError(f"Unexpected Import Results: {len(rows)} Rows For {count} Terms")
+        return rows
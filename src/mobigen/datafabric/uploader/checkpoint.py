@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import collections
+import hashlib
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Any, Deque, Iterable, Iterator, Optional, Set, Tuple, TypeVar
+
+from mobigen.datafabric.reader.sheet_cache import DEFAULT_CACHE_DIR, file_content_hash
+from mobigen.datafabric.uploader.term_uploader import UploadListener
+from mobigen.datafabric.utils.logger import cli_logger
+
+if TYPE_CHECKING:
+    from generated.schema.api.data.createGlossaryTerm import CreateGlossaryTermRequest
+
+logger = cli_logger()
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(DEFAULT_CACHE_DIR, "checkpoints")
+CHECKPOINT_VERSION = "1"
+# A checkpoint is written after SAVE_INTERVAL completed terms or SAVE_SECONDS, whichever comes first
+SAVE_INTERVAL = 200
+SAVE_SECONDS = 5.0
+
+T = TypeVar("T")
+
+
+class UploadCheckpoint(UploadListener):
+    """
+    Progress of the upload of one sheet into one glossary, written to a small json file.
+
+    Terms complete out of order with concurrency, so the checkpoint keeps a watermark:
+    every term dispatched up to the watermark row is finished. Finished rows above the watermark
+    are kept aside (at most the number of pending uploads), and failed rows are kept to be retried.
+    """
+
+    def __init__(self,
+                 checkpoint_dir: str,
+                 file_path: str,
+                 sheet_name: str,
+                 glossary_fqn: str):
+        self.file_path = file_path
+        self.sheet_name = sheet_name
+        self.glossary_fqn = glossary_fqn
+        key = "|".join([CHECKPOINT_VERSION, os.path.abspath(file_path), str(sheet_name), glossary_fqn])
+        self.path = os.path.join(checkpoint_dir, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json")
+        self.content_hash = file_content_hash(file_path)
+
+        self.watermark: Optional[int] = None
+        self.completed: Set[int] = set()
+        self.failed: Set[int] = set()
+        self.skipped = 0
+
+        self._dispatched: Deque[int] = collections.deque()
+        self._finished: Set[int] = set()
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+
+    def resume(self) -> bool:
+        """
+        Load the last checkpoint of the sheet
+        :return: False when there is no usable checkpoint
+        """
+        if not os.path.exists(self.path):
+            logger.info(f"No Checkpoint To Resume: {self.sheet_name}")
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as file_:
+                state = json.load(file_)
+        except Exception as e:
+            logger.warning(f"Failed To Read Checkpoint: {self.path}, {e}")
+            return False
+        if state.get("content_hash") != self.content_hash:
+            logger.warning(f"File Changed Since The Checkpoint, Upload From The Start: {self.file_path}")
+            return False
+        self.watermark = state.get("watermark")
+        self.completed = set(state.get("completed", []))
+        self.failed = set(state.get("failed", []))
+        logger.info(f"Resume From Checkpoint: {self.sheet_name}, Row: {self.watermark}, "
+                    f"Failed Rows To Retry: {len(self.failed)}")
+        return True
+
+    def is_done(self, index: int) -> bool:
+        if index in self.failed:
+            return False
+        if self.watermark is not None and index <= self.watermark:
+            return True
+        return index in self.completed
+
+    def skip_done(self, rows: Iterable[Tuple[int, T]]) -> Iterator[Tuple[int, T]]:
+        """
+        Drop the rows already uploaded by the interrupted run
+        """
+        for index, row in rows:
+            if self.is_done(index):
+                self.skipped += 1
+                continue
+            yield index, row
+
+    def track(self,
+              terms: Iterable[Tuple[int, CreateGlossaryTermRequest]]) -> Iterator[Tuple[int, CreateGlossaryTermRequest]]:
+        """
+        Remember the dispatch order of the terms, must wrap the terms given to the uploader
+        """
+        for index, term in terms:
+            self._dispatched.append(index)
+            yield index, term
+
+    def add_invalid(self, index: int):
+        """
+        The row failed before reaching the uploader (mapping). It is never dispatched, so the watermark
+        goes past it: keep it with the failed rows to retry it on resume.
+        """
+        self.failed.add(index)
+
+    def on_success(self, index: int, term: CreateGlossaryTermRequest, result: Any):
+        self.failed.discard(index)
+        self._finish(index)
+
+    def on_failure(self, index: int, term: CreateGlossaryTermRequest, error: Exception):
+        self.failed.add(index)
+        self._finish(index)
+
+    def _finish(self, index: int):
+        self._finished.add(index)
+        while self._dispatched and self._dispatched[0] in self._finished:
+            done = self._dispatched.popleft()
+            self._finished.discard(done)
+            self.completed.discard(done)
+            if self.watermark is None or done > self.watermark:
+                self.watermark = done
+        self._unsaved += 1
+        if self._unsaved >= SAVE_INTERVAL or time.monotonic() - self._saved_at >= SAVE_SECONDS:
+            self.save()
+
+    def save(self):
+        """
+        Write the checkpoint atomically, a crash leaves either the previous or the new checkpoint
+        """
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "file_path": os.path.abspath(self.file_path),
+            "sheet_name": self.sheet_name,
+            "glossary": self.glossary_fqn,
+            "content_hash": self.content_hash,
+            "watermark": self.watermark,
+            "completed": sorted(index for index in self.completed | self._finished
+                                if self.watermark is None or index > self.watermark),
+            "failed": sorted(self.failed),
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as file_:
+                json.dump(state, file_)
+                file_.flush()
+                os.fsync(file_.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Failed To Write Checkpoint: {self.path}, {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+
+    def close(self, finished: bool):
+        """
+        :param finished: the whole sheet was dispatched, the checkpoint is removed when no row failed
+        """
+        if finished and not self.failed:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        self.save()
+        logger.info(f"Checkpoint Saved: {self.path}")
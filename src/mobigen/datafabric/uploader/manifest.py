@@ -0,0 +1,109 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from generated.schema.api.data.createGlossaryTerm import CreateGlossaryTermRequest
+from mobigen.datafabric.glossary_term.fingerprint import request_fingerprint
+from mobigen.datafabric.uploader.term_uploader import UploadListener, UploadSummary
+from mobigen.datafabric.utils.logger import cli_logger
+from mobigen.datafabric.utils.utils import model_str
+
+logger = cli_logger()
+
+# Pending rows are committed every COMMIT_INTERVAL uploads
+COMMIT_INTERVAL = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploaded_terms (
+    glossary_fqn TEXT NOT NULL,
+    name TEXT NOT NULL,
+    payload_hash TEXT NOT NULL,
+    entity_id TEXT,
+    version REAL,
+    uploaded_at REAL NOT NULL,
+    PRIMARY KEY (glossary_fqn, name)
+)
+"""
+
+
+class TermManifest(UploadListener):
+    """
+    Local SQLite record of the terms uploaded to a glossary: payload fingerprint, server id and version.
+    The fingerprints of the glossary are loaded in memory once, so checking a row is a dict lookup.
+    """
+
+    def __init__(self, path: str, glossary_fqn: str):
+        self.path = path
+        self.glossary_fqn = glossary_fqn
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.fingerprints: Dict[str, str] = {}
+        self.load()
+
+    def load(self):
+        rows = self._conn.execute(
+            "SELECT name, payload_hash FROM uploaded_terms WHERE glossary_fqn = ?",
+            (self.glossary_fqn,),
+        )
+        self.fingerprints = dict(rows)
+        logger.info(f"Glossary Terms In Manifest: {len(self.fingerprints)}, Path: {self.path}")
+
+    def record(self, name: str, payload_hash: str, entity_id: Optional[str], version: Optional[float]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uploaded_terms VALUES (?, ?, ?, ?, ?, ?)",
+                (self.glossary_fqn, name, payload_hash, entity_id, version, time.time()),
+            )
+            self.fingerprints[name] = payload_hash
+            self._pending += 1
+            if self._pending >= COMMIT_INTERVAL:
+                self._conn.commit()
+                self._pending = 0
+
+    def replace_all(self, entries: Iterable[Tuple[str, str, Optional[str], Optional[float]]]):
+        """
+        Replace the records of the glossary, e.g. with the terms listed from the server
+        :param entries: (name, payload hash, entity id, version)
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM uploaded_terms WHERE glossary_fqn = ?", (self.glossary_fqn,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO uploaded_terms VALUES (?, ?, ?, ?, ?, ?)",
+                ((self.glossary_fqn, name, payload_hash, entity_id, version, now)
+                 for name, payload_hash, entity_id, version in entries),
+            )
+            self._conn.commit()
+            self._pending = 0
+        self.load()
+
+    def filter(self,
+               terms: Iterable[Tuple[int, CreateGlossaryTermRequest]],
+               summary: UploadSummary) -> Iterator[Tuple[int, CreateGlossaryTermRequest]]:
+        """
+        Yield only the terms whose payload differs from the last uploaded one
+        """
+        for index, term in terms:
+            if self.fingerprints.get(model_str(term.name)) == request_fingerprint(term):
+                logger.debug(f"Unchanged Glossary Term (manifest): {index}: {term.name}")
+                summary.unchanged += 1
+                continue
+            yield index, term
+
+    def on_success(self, index: int, term: CreateGlossaryTermRequest, result: Any):
+        entity_id = model_str(result.id) if getattr(result, "id", None) is not None else None
+        version = model_str(result.version) if getattr(result, "version", None) is not None else None
+        self.record(model_str(term.name), request_fingerprint(term), entity_id,
+                    float(version) if version is not None else None)
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
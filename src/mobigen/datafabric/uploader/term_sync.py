@@ -0,0 +1,119 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from generated.schema.api.data.createGlossaryTerm import CreateGlossaryTermRequest
+from generated.schema.entity.data.glossary import Glossary
+from generated.schema.entity.data.glossaryTerm import GlossaryTerm
+from mobigen.datafabric.client.api import APIS
+from mobigen.datafabric.glossary_term.fingerprint import entity_fingerprint, request_fingerprint
+from mobigen.datafabric.uploader.term_uploader import TermPatch, TermPatcher, UploadSummary
+from mobigen.datafabric.utils.logger import cli_logger
+from mobigen.datafabric.utils.utils import model_str
+
+logger = cli_logger()
+
+LIST_LIMIT = 1000
+
+
+class RemoteTerm(NamedTuple):
+    fingerprint: str
+    entity_id: str
+    version: Optional[float]
+    display_name: Optional[str]
+    description: Optional[str]
+    synonyms: Optional[List[str]]
+    related_terms: List[str]
+
+
+def build_term_patch(remote: RemoteTerm, term: CreateGlossaryTermRequest) -> Optional[List[dict]]:
+    """
+    JSON Patch operations turning the server copy into the term of the request.
+    "add" replaces the member when it exists. Related terms are references, a change is left to a PUT.
+    :return: None when the difference can not be patched
+    """
+    related_terms = [model_str(related) for related in term.relatedTerms or ()]
+    if set(related_terms) != set(remote.related_terms):
+        return None
+
+    operations = []
+    if term.displayName and model_str(term.displayName) != remote.display_name:
+        operations.append({"op": "add", "path": "/displayName", "value": model_str(term.displayName)})
+    description = model_str(term.description) if term.description else ""
+    if description != (remote.description or ""):
+        operations.append({"op": "add", "path": "/description", "value": description})
+
+    synonyms = list(dict.fromkeys(model_str(synonym) for synonym in term.synonyms or ()))
+    if remote.synonyms is None:
+        if synonyms:
+            operations.append({"op": "add", "path": "/synonyms", "value": synonyms})
+    else:
+        wanted = set(synonyms)
+        # remove from the end so that the indexes of the remaining synonyms do not move
+        for position in reversed(range(len(remote.synonyms))):
+            if remote.synonyms[position] not in wanted:
+                operations.append({"op": "remove", "path": f"/synonyms/{position}"})
+        existing = set(remote.synonyms)
+        for synonym in synonyms:
+            if synonym not in existing:
+                operations.append({"op": "add", "path": "/synonyms/-", "value": synonym})
+    return operations or None
+
+
+class TermSync(TermPatcher):
+    """
+    Delta sync against the terms already stored in the glossary.
+    Terms whose content fingerprint matches the server copy are not uploaded again,
+    modified terms can be updated with a JSON Patch against the server copy.
+    """
+
+    def __init__(self, api: APIS, glossary: Glossary):
+        self.api = api
+        self.glossary = glossary
+        self.remote_terms: Dict[str, RemoteTerm] = {}
+
+    def load(self):
+        """
+        Fetch the fingerprints of every term of the glossary
+        """
+        self.remote_terms.clear()
+        for term in self.api.list_all_entities(
+                entity=GlossaryTerm,
+                fields=["relatedTerms"],
+                limit=LIST_LIMIT,
+                params={"glossary": model_str(self.glossary.id)},
+        ):
+            self.remote_terms[model_str(term.name)] = RemoteTerm(
+                fingerprint=entity_fingerprint(term),
+                entity_id=model_str(term.id),
+                version=float(model_str(term.version)) if term.version is not None else None,
+                display_name=model_str(term.displayName) if term.displayName is not None else None,
+                description=model_str(term.description) if term.description is not None else None,
+                synonyms=[model_str(synonym) for synonym in term.synonyms] if term.synonyms is not None else None,
+                related_terms=[model_str(related.fullyQualifiedName) for related in term.relatedTerms or ()],
+            )
+        logger.info(f"Glossary Terms On Server: {len(self.remote_terms)}")
+
+    def filter(self,
+               terms: Iterable[Tuple[int, CreateGlossaryTermRequest]],
+               summary: UploadSummary) -> Iterator[Tuple[int, CreateGlossaryTermRequest]]:
+        """
+        Yield only the new and modified terms, unchanged terms are counted in the summary
+        """
+        for index, term in terms:
+            name = model_str(term.name)
+            existing = self.remote_terms.get(name)
+            if existing is None:
+                summary.mark_new(index)
+            elif existing.fingerprint == request_fingerprint(term):
+                logger.debug(f"Unchanged Glossary Term: {index}: {name}")
+                summary.unchanged += 1
+                continue
+            yield index, term
+
+    def plan(self, term: CreateGlossaryTermRequest) -> Optional[TermPatch]:
+        remote = self.remote_terms.get(model_str(term.name))
+        if remote is None:
+            return None
+        operations = build_term_patch(remote, term)
+        if operations is None:
+            return None
+        return TermPatch(GlossaryTerm, remote.entity_id, operations)
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Type
+
+from mobigen.datafabric.utils.logger import cli_logger
+
+if TYPE_CHECKING:
+    # only for annotations, the CLI imports this module before choosing a sub-command
+    from generated.schema.api.data.createGlossaryTerm import CreateGlossaryTermRequest
+    from mobigen.datafabric.client.api import APIS
+
+logger = cli_logger()
+
+
+class UploadMode(Enum):
+    # one PUT per term
+    PUT = 'put'
+    # server CSV import, one request per chunk of terms
+    BULK_IMPORT = 'bulk-import'
+
+
+class UploadFailure:
+    def __init__(self, index: int, name: str, error: Exception):
+        self.index = index
+        self.name = name
+        self.error = error
+
+
+class UploadSummary:
+    """
+    Result of an upload. Failures are kept in row order whatever the completion order was.
+    With delta sync, successful uploads are split into created and updated terms.
+    The manifest only tells unchanged terms apart, it does not know which terms exist on the server.
+    """
+
+    def __init__(self, sync: bool = False, manifest: bool = False):
+        self.sync = sync
+        self.manifest = manifest
+        self.succeeded = 0
+        self.created = 0
+        self.unchanged = 0
+        # rows skipped because their term name belongs to another sheet
+        self.duplicates = 0
+        self.failures: List[UploadFailure] = []
+        self._new_indexes: Set[int] = set()
+
+    @property
+    def updated(self) -> int:
+        return self.succeeded - self.created
+
+    def mark_new(self, index: int):
+        """ The term of the row does not exist on the server yet """
+        self._new_indexes.add(index)
+
+    def add_success(self, index: int):
+        self.succeeded += 1
+        if index in self._new_indexes:
+            self.created += 1
+
+    @property
+    def failed(self) -> int:
+        return len(self.failures)
+
+    @property
+    def total(self) -> int:
+        return self.succeeded + self.failed
+
+    def add_failure(self, failure: UploadFailure):
+        self.failures.append(failure)
+
+    def log(self, title: str):
+        self.failures.sort(key=lambda failure: failure.index)
+        logger.info(f"{title}: Total: {self.total}, Succeeded: {self.succeeded}, Failed: {self.failed}")
+        if self.duplicates:
+            logger.warning(f"{title}: Duplicate Terms Skipped: {self.duplicates}")
+        if self.sync:
+            logger.info(f"{title}: Created: {self.created}, Updated: {self.updated}, Unchanged: {self.unchanged}")
+        elif self.manifest:
+            logger.info(f"{title}: Unchanged: {self.unchanged}")
+        for failure in self.failures:
+            logger.error(f"Failed Term: {failure.index}: {failure.name}, {failure.error}")
+
+
+class UploadListener:
+    """
+    Notified of every finished upload, always from the thread running TermUploader.upload
+    """
+
+    def on_success(self, index: int, term: CreateGlossaryTermRequest, result: Any):
+        pass
+
+    def on_failure(self, index: int, term: CreateGlossaryTermRequest, error: Exception):
+        pass
+
+
+class TermPatch(NamedTuple):
+    entity: Type
+    entity_id: str
+    operations: List[dict]
+
+
+class TermPatcher:
+    """
+    Plans JSON Patch updates of the terms already on the server
+    """
+
+    def plan(self, term: CreateGlossaryTermRequest) -> Optional[TermPatch]:
+        """
+        :return: None when the term must be PUT
+        """
+        return None
+
+
+class TermUploader:
+    """
+    PUT glossary terms through APIS.
+    With concurrency > 1 the requests are dispatched from a bounded thread pool sharing the api client,
+    at most 2 * concurrency terms are waiting in memory.
+    """
+
+    def __init__(self,
+                 api: APIS,
+                 concurrency: int = 1,
+                 prewarm: int = 0,
+                 listeners: Optional[List[UploadListener]] = None,
+                 patcher: Optional[TermPatcher] = None):
+        self.api = api
+        self.concurrency = max(1, concurrency)
+        self.prewarm = prewarm
+        self.listeners = listeners or []
+        self.patcher = patcher
+
+    def plan_patch(self, index: int, term: CreateGlossaryTermRequest) -> Optional[TermPatch]:
+        if self.patcher is None:
+            return None
+        patch = self.patcher.plan(term)
+        if patch is not None:
+            logger.info(f"Patch Glossary Term: {index}: {term.name}, {patch.operations}")
+        return patch
+
+    def upload_term(self, index: int, term: CreateGlossaryTermRequest):
+        patch = self.plan_patch(index, term)
+        if patch is not None:
+            return self.api.patch(patch.entity, patch.entity_id, patch.operations, lean=True)
+        logger.info(f"Create Glossary Term: {index}: {term.name}, {term.synonyms}")
+        logger.debug(f"Glossary Term Detail: {term.__str__()}")
+        # The created entity is not used, only id/version are picked from the response
+        return self.api.create_or_update(term, lean=True)
+
+    def upload(self,
+               terms: Iterable[Tuple[int, CreateGlossaryTermRequest]],
+               summary: Optional[UploadSummary] = None) -> UploadSummary:
+        """
+        :param terms: (row index, create request) pairs
+        :param summary: summary to update, a new one by default
+        """
+        summary = summary or UploadSummary()
+        if self.prewarm:
+            self.api.client.prewarm(self.prewarm)
+        if self.concurrency == 1:
+            for index, term in terms:
+                self._run(summary, index, term)
+            return summary
+
+        max_pending = self.concurrency * 2
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="uploader") as executor:
+            pending: Dict[Future, Tuple[int, CreateGlossaryTermRequest]] = {}
+            for index, term in terms:
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._collect(summary, future, *pending.pop(future))
+                pending[executor.submit(self.upload_term, index, term)] = (index, term)
+            for future, (index, term) in pending.items():
+                self._collect(summary, future, index, term)
+        return summary
+
+    def _run(self, summary: UploadSummary, index: int, term: CreateGlossaryTermRequest):
+        try:
+            result = self.upload_term(index, term)
+        except Exception as e:
+            self._record(summary, index, term, error=e)
+            return
+        self._record(summary, index, term, result=result)
+
+    def _collect(self, summary: UploadSummary, future: Future, index: int, term: CreateGlossaryTermRequest):
+        error = future.exception()
+        if error is not None:
+            self._record(summary, index, term, error=error)
+            return
+        self._record(summary, index, term, result=future.result())
+
+    def _record(self,
+                summary: UploadSummary,
+                index: int,
+                term: CreateGlossaryTermRequest,
+                result: Any = None,
+                error: Exception = None):
+        if error is None:
+            summary.add_success(index)
+            for listener in self.listeners:
+                listener.on_success(index, term, result)
+            return
+        logger.error(f"Error: {index}: {term.name}, {error}")
+        summary.add_failure(UploadFailure(index, str(term.name), error))
+        for listener in self.listeners:
+            listener.on_failure(index, term, error)
+
+
+class AsyncTermUploader(TermUploader):
+    """
+    PUT glossary terms with the asyncio methods of APIS.
+    All requests are multiplexed on one thread, concurrency bounds the number of requests in flight.
+    """
+
+    async def upload_term_async(self, index: int, term: CreateGlossaryTermRequest):
+        patch = self.plan_patch(index, term)
+        if patch is not None:
+            return await self.api.apatch(patch.entity, patch.entity_id, patch.operations, lean=True)
+        logger.info(f"Create Glossary Term: {index}: {term.name}, {term.synonyms}")
+        logger.debug(f"Glossary Term Detail: {term.__str__()}")
+        return await self.api.acreate_or_update(term, lean=True)
+
+    def upload(self,
+               terms: Iterable[Tuple[int, CreateGlossaryTermRequest]],
+               summary: Optional[UploadSummary] = None) -> UploadSummary:
+        summary = summary or UploadSummary()
+        asyncio.run(self._upload(terms, summary))
+        return summary
+
+    async def _upload(self, terms: Iterable[Tuple[int, CreateGlossaryTermRequest]], summary: UploadSummary):
+        in_flight = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        if self.prewarm:
+            await self.api.async_client.prewarm(self.prewarm)
+
+        async def run(index: int, term: CreateGlossaryTermRequest):
+            try:
+                result = await self.upload_term_async(index, term)
+            except Exception as e:
+                self._record(summary, index, term, error=e)
+                return
+            finally:
+                in_flight.release()
+            self._record(summary, index, term, result=result)
+
+        try:
+            for index, term in terms:
+                await in_flight.acquire()
+                task = asyncio.create_task(run(index, term))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            # the aiohttp session belongs to this event loop
+            await self.api.aclose()
@@ -0,0 +1,25 @@
+import asyncio
+
+from mobigen.datafabric.client.rate_control import RateController
+
+
+def run_tasks(controller: RateController, count: int, status_code: int = 200):
+    async def task():
+        async with controller.async_slot() as permit:
+            await asyncio.sleep(0.01)
+            permit.observe(status_code)
+
+    async def main():
+        await asyncio.gather(*(task() for _ in range(count)))
+
+    asyncio.run(main())
+
+
+def test_async_slot_across_event_loops():
+    """ The uploader runs one event loop per sheet with the same client """
+    controller = RateController(adaptive=True, max_in_flight=2)
+    # the overload lowers the limit to 1, the tasks wait for a slot
+    run_tasks(controller, 8, status_code=429)
+    assert controller.limit == 1.0
+    run_tasks(controller, 8)
+    assert controller.in_flight == 0